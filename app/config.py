@@ -31,6 +31,12 @@ class Settings(BaseSettings):
     MP_WEBHOOK_SECRET: str = Field(default="")
     MP_PUBLIC_KEY: str = Field(default="")
     
+    # Redis (optional) - used to deduplicate Mercado Pago webhook retries across
+    # workers. The redis package is not a project dependency: install it
+    # separately to enable this; otherwise duplicates are tracked per process
+    REDIS_URL: str = Field(default="")
+    MP_WEBHOOK_DEDUP_SECONDS: int = Field(default=86400)  # 24 hours
+    
     # File upload limits (configurable via environment variable)
     # Removed limits - users can upload large files
     MAX_UPLOAD_MB: int = Field(default=10000)  # 10GB - practically unlimited
@@ -54,9 +60,25 @@ class Settings(BaseSettings):
     CONVERSION_TIMEOUT_SECONDS: int = Field(default=300)  # 5 minutes
     MAX_CONVERSION_FILE_SIZE_MB: int = Field(default=100)
     ENABLE_OCR: bool = Field(default=False)
+    OCR_MAX_PAGES: int = Field(default=5)  # Pages OCR'd per document, 0 = all
+    OCR_LANG: str = Field(default="por+eng")
+    GPU_JPEG_ENCODE: bool = Field(default=False)  # Requires torch/torchvision with CUDA
+    PDFMINER_MAX_PAGES: int = Field(default=200)  # Longer PDFs skip the slow pdfminer fallback
+    CONVERSION_WORKERS: int = Field(default=0)  # CPU worker threads/processes, 0 = cpu_count
+    # Root for conversion work dirs and cache; empty = system temp dir. A tmpfs
+    # such as /dev/shm keeps scratch I/O in RAM but is size-limited (often 50% of RAM)
+    CONVERSION_TEMP_DIR: str = Field(default="")
+    CONVERSION_CACHE_ENABLED: bool = Field(default=True)
+    CONVERSION_CACHE_MAX_MB: int = Field(default=1024)
+    WORKDIR_TTL_SECONDS: int = Field(default=1800)  # Job work dirs older than this are swept
+    LIBREOFFICE_DAEMON: bool = Field(default=False)  # Warm soffice over UNO; requires python3-uno
+    LIBREOFFICE_UNO_PORT: int = Field(default=2002)
+    LIBREOFFICE_BATCH_SIZE: int = Field(default=20)  # Files per soffice run
+    LIBREOFFICE_PROFILES: int = Field(default=2)  # Concurrent soffice processes, one profile each
     
     # Job settings
     MAX_CONCURRENT_JOBS: int = Field(default=4)
+    MAX_CONCURRENT_JOBS_PER_OPERATION: int = Field(default=2)  # Same-kind jobs queue beyond this
     JOB_CLEANUP_HOURS: int = Field(default=24)
     
     # Security & CSRF
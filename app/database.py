@@ -3,7 +3,7 @@ Database configuration and initialization
 """
 import os
 import asyncio
-from sqlalchemy import create_engine, MetaData, event
+from sqlalchemy import create_engine, MetaData, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -67,18 +67,54 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
-    """Dependency to get database session"""
+    """Dependency to get database session
+    
+    The session is a unit of work for the whole request: pending changes are
+    committed once when the handler returns, or rolled back if it raises.
+    """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
+def _add_quota_usage_daily_key():
+    """Create the (user_id, date) unique key on quota_usage if it is missing,
+    first folding duplicate rows into the oldest one so no usage is lost"""
+    inspector = inspect(engine)
+    keys = inspector.get_unique_constraints("quota_usage") + inspector.get_indexes("quota_usage")
+    if any(key.get("name") == "_quota_usage_daily" for key in keys):
+        return
+    
+    with engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE quota_usage SET operations_count = "
+            "(SELECT SUM(q.operations_count) FROM quota_usage q "
+            "WHERE q.user_id = quota_usage.user_id AND q.date = quota_usage.date) "
+            "WHERE id IN (SELECT MIN(id) FROM quota_usage "
+            "GROUP BY user_id, date HAVING COUNT(*) > 1)"
+        ))
+        conn.execute(text(
+            "DELETE FROM quota_usage WHERE id NOT IN "
+            "(SELECT MIN(id) FROM quota_usage GROUP BY user_id, date)"
+        ))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX _quota_usage_daily ON quota_usage (user_id, date)"
+        ))
+
 async def init_db():
     """Initialize database tables"""
     from app.models import User, Subscription, Invoice, Coupon, AuditLog, QuotaUsage, AnonQuota
     Base.metadata.create_all(bind=engine)
     
+    # create_all does not alter existing tables: add the daily unique key to
+    # quota_usage tables created before it existed
+    _add_quota_usage_daily_key()
+    
     # Create default admin user if not exists
     db = SessionLocal()
     try:
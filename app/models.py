@@ -95,6 +95,9 @@ class QuotaUsage(Base):
     
     # Relationships
     user = relationship("User", back_populates="quota_usage")
+    
+    # One row per user per day, so the counter can be upserted atomically
+    __table_args__ = (UniqueConstraint('user_id', 'date', name='_quota_usage_daily'),)
 
 class AnonQuota(Base):
     """Anonymous user quota tracking"""
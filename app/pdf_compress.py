@@ -1,6 +1,7 @@
 """
 Compressão avançada de PDFs usando Ghostscript, qpdf e pikepdf.
 """
+import io
 import subprocess
 import shutil
 import pikepdf
@@ -233,13 +234,15 @@ def _compress_with_qpdf_pikepdf(input_path: str, output_path: str) -> bool:
     """Comprime usando qpdf + pikepdf (otimização estrutural)."""
     try:
         # Tentar qpdf primeiro
-        if shutil.which("qpdf"):
+        qpdf_available = shutil.which("qpdf") is not None
+        if qpdf_available:
             qpdf_args = [
                 "qpdf",
-                "--linearize",
+                # Sem --linearize: o passe final do pikepdf já lineariza
                 "--object-streams=generate",
                 "--compress-streams=y",
                 "--recompress-flate",
+                "--compression-level=9",
                 input_path,
                 output_path
             ]
@@ -248,13 +251,14 @@ def _compress_with_qpdf_pikepdf(input_path: str, output_path: str) -> bool:
             # Fallback para apenas pikepdf
             shutil.copy2(input_path, output_path)
         
-        # Pós-processar com pikepdf
+        # Pós-processar com pikepdf (recomprime os streams só se o qpdf não rodou)
         with pikepdf.open(output_path, allow_overwriting_input=True) as pdf:
             pdf.remove_unreferenced_resources()
             pdf.save(
                 output_path,
                 compress_streams=True,
                 object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                recompress_flate=not qpdf_available,
                 linearize=True
             )
         
@@ -265,6 +269,25 @@ def _compress_with_qpdf_pikepdf(input_path: str, output_path: str) -> bool:
         return False
 
 
+def compress_pdf_bytes(data: bytes) -> bytes:
+    """
+    Otimização estrutural (pikepdf) inteiramente em memória.
+    
+    Usado quando o PDF acabou de ser produzido por outra etapa (ex.: merge),
+    evitando gravar e reabrir um arquivo intermediário.
+    """
+    out_buf = io.BytesIO()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            out_buf,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            linearize=True
+        )
+    return out_buf.getvalue()
+
+
 def _postprocess_with_qpdf_pikepdf(pdf_path: str) -> None:
     """Pós-processamento com qpdf e pikepdf para otimização final."""
     try:
@@ -274,10 +297,11 @@ def _postprocess_with_qpdf_pikepdf(pdf_path: str) -> None:
         if shutil.which("qpdf"):
             qpdf_args = [
                 "qpdf",
-                "--linearize",
+                # Sem --linearize: o passe final do pikepdf já lineariza
                 "--object-streams=generate",
                 "--compress-streams=y",
                 "--recompress-flate",
+                "--compression-level=9",
                 pdf_path,
                 temp_path
             ]
@@ -303,6 +327,7 @@ def _postprocess_with_qpdf_pikepdf(pdf_path: str) -> None:
                     pdf_path,
                     compress_streams=True,
                     object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                    recompress_flate=True,
                     linearize=True
                 )
     except Exception as e:
@@ -3,20 +3,26 @@ Billing and subscription routes
 """
 import hmac
 import hashlib
+from contextlib import contextmanager
 from fastapi import APIRouter, Request, Depends, Form, HTTPException, status, BackgroundTasks
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.auth import require_auth, get_optional_user
 from app.models import User, Subscription
 from app.services.billing_service import BillingService
-from app.template_helpers import templates
+from app.template_helpers import templates, get_translations
 from app.config import settings
 
 router = APIRouter()
 billing_service = BillingService()
 
+def _process_payment_notification(payment_id: str) -> None:
+    """Background task: the request's session is closed by the time it runs,
+    so process the payment in its own get_db unit of work"""
+    with contextmanager(get_db)() as db:
+        billing_service.process_payment_notification(db, payment_id)
+
 @router.get("/pricing", response_class=HTMLResponse)
 async def pricing(
     request: Request,
@@ -111,8 +117,7 @@ async def create_checkout(
 @router.post("/webhook")
 async def mercado_pago_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """Handle Mercado Pago webhook notifications"""
     try:
@@ -135,10 +140,7 @@ async def mercado_pago_webhook(
         if notification.get("type") == "payment":
             payment_id = notification.get("data", {}).get("id")
             if payment_id:
-                background_tasks.add_task(
-                    billing_service.process_payment_notification,
-                    db, payment_id
-                )
+                background_tasks.add_task(_process_payment_notification, payment_id)
         
         return {"status": "ok"}
     
@@ -159,7 +161,7 @@ async def payment_success(
         {
             "request": request,
             "user": user,
-            "translations": translations
+            "translations": get_translations()
         }
     )
 
@@ -175,7 +177,7 @@ async def payment_failure(
         {
             "request": request,
             "user": user,
-            "translations": translations
+            "translations": get_translations()
         }
     )
 
@@ -191,6 +193,6 @@ async def payment_pending(
         {
             "request": request,
             "user": user,
-            "translations": translations
+            "translations": get_translations()
         }
     )
@@ -2,12 +2,14 @@
 Tools router for PDF conversion and manipulation
 """
 import os
+import hashlib
 import tempfile
 import logging
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 import uuid
 import mimetypes
+from functools import partial
 try:
     import magic
 except ImportError:
@@ -22,7 +24,7 @@ from app.database import get_db
 from app.template_helpers import templates
 from app.auth import require_auth, get_current_user, get_optional_user
 from app.services.job_service import job_service
-from app.services.conversion import ConversionError
+from app.services.conversion import ConversionError, conversion_service, JPEG_QUALITY
 from app.models import User
 from app.config import settings
 from app.services.quota_service import QuotaService
@@ -72,7 +74,7 @@ ALLOWED_MIME_TYPES = {
 #     else:
 #         return settings.MAX_FILE_SIZE_FREE
 
-async def save_uploaded_file(upload_file: UploadFile, work_dir: Path) -> str:
+async def save_uploaded_file(upload_file: UploadFile, work_dir: Path, job_id: Optional[str] = None) -> str:
     """Save uploaded file to work directory"""
     # Validate file type using python-magic if available
     file_content = await upload_file.read()
@@ -95,6 +97,10 @@ async def save_uploaded_file(upload_file: UploadFile, work_dir: Path) -> str:
     with open(file_path, "wb") as f:
         f.write(file_content)
     
+    if job_id:
+        # Hash while the bytes are in memory so the conversion cache needn't re-read the file
+        conversion_service.register_input(job_id, str(file_path), hashlib.sha256(file_content).hexdigest())
+    
     return str(file_path)
 
 @router.get("/")
@@ -189,24 +195,30 @@ async def start_conversion(
     page_ranges: Optional[str] = Form(None),
     image_format: Optional[str] = Form("png"),
     image_dpi: Optional[int] = Form(200),
+    jpeg_quality: Optional[int] = Form(JPEG_QUALITY),
     use_ocr: Optional[bool] = Form(False),
     grayscale: Optional[bool] = Form(False),
     rasterize: Optional[bool] = Form(False),
+    compress: Optional[bool] = Form(False),
     files: List[UploadFile] = File(...),
     user: User = Depends(get_optional_user),
     db: Session = Depends(get_db)
 ):
     """Start a new conversion job"""
+    reserved = False
+    job_id = None
     try:
         # Validate operation
         if operation not in CONVERSION_OPERATIONS:
             raise HTTPException(status_code=400, detail=f"Unsupported operation: {operation}")
         
-        # Check quotas and limits
+        # Check quotas and count the operation in one round-trip; given
+        # back below if the job does not start, or by the job if it fails
         if user:
-            allowed, message, requires_watermark = quota_service.check_operation_allowed(db, user)
+            allowed, message, requires_watermark = quota_service.reserve_operation(db, user)
             if not allowed:
                 raise HTTPException(status_code=429, detail=message)
+            reserved = True
         
         # File size validation removed - users can upload large files
         # max_file_size = get_max_file_size(user)
@@ -232,7 +244,7 @@ async def start_conversion(
         input_files = []
         for i, file in enumerate(files):
             if file.filename:
-                file_path = await save_uploaded_file(file, work_dir)
+                file_path = await save_uploaded_file(file, work_dir, job_id)
                 input_files.append(file_path)
                 logger.info(f"Saved file {i+1}: {file.filename} -> {file_path}")
         
@@ -243,11 +255,13 @@ async def start_conversion(
         options = {
             "format": image_format,
             "dpi": image_dpi,
+            "jpeg_quality": max(40, min(jpeg_quality or JPEG_QUALITY, 100)),  # 40-100
             "level": compression_level,
             "ranges": page_ranges or "1",
             "use_ocr": use_ocr and settings.ENABLE_OCR,
             "grayscale": grayscale,
             "rasterize": rasterize,
+            "compress": compress,  # merge_pdf: compress the merged file
         }
         
         # Start conversion job
@@ -256,13 +270,10 @@ async def start_conversion(
             operation=operation,
             input_files=input_files,
             options=options,
-            job_id=job_id
+            job_id=job_id,
+            on_failure=partial(quota_service.refund_operation, user.id) if reserved else None
         )
         
-        # Increment user operations count
-        if user:
-            quota_service.increment_operation_count(db, user)
-        
         return JSONResponse({
             "job_id": result_job_id,
             "status": "started",
@@ -270,9 +281,20 @@ async def start_conversion(
         })
         
     except HTTPException:
+        if job_id is not None:
+            # Inputs saved so far were registered; no job task will release them
+            conversion_service.release_job(job_id)
+        if reserved:
+            quota_service.release_operation(db, user)
         raise
     except Exception as e:
         logger.error(f"Failed to start conversion: {str(e)}")
+        if job_id is not None:
+            conversion_service.release_job(job_id)
+        if reserved:
+            # The session may be in a failed state
+            db.rollback()
+            quota_service.release_operation(db, user)
         raise HTTPException(status_code=500, detail="Failed to start conversion job")
 
 @router.get("/api/jobs/{job_id}")
@@ -282,11 +304,11 @@ async def get_job_status(
 ):
     """Get job status and progress"""
     try:
-        job_status = job_service.get_job_status(job_id)
-        if not job_status:
+        job_json = job_service.get_job_json(job_id)
+        if job_json is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return JSONResponse(job_status)
+        return Response(content=job_json, media_type="application/json")
         
     except HTTPException:
         raise
@@ -359,8 +381,7 @@ async def list_jobs(
 ):
     """List recent jobs"""
     try:
-        jobs = job_service.list_jobs(limit)
-        return JSONResponse({"jobs": jobs})
+        return Response(content=job_service.list_jobs_json(limit), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to list jobs: {str(e)}")
@@ -404,6 +425,7 @@ async def process_images_to_pdf(
     """Convert multiple images to a single PDF"""
     from app.images_to_pdf import images_to_pdf, get_compression_info
     
+    reserved = False
     try:
         # Validate parameters (whitelist)
         valid_page_sizes = ["a3", "a4", "a5", "letter", "auto"]
@@ -423,11 +445,12 @@ async def process_images_to_pdf(
         margin_mm = max(0, min(margin_mm, 50))  # 0-50mm
         jpeg_quality = max(40, min(jpeg_quality, 100))  # 40-100
         
-        # Check quotas and limits
+        # Check quotas and count the operation; given back below on failure
         if user:
-            allowed, message, requires_watermark = quota_service.check_operation_allowed(db, user)
+            allowed, message, requires_watermark = quota_service.reserve_operation(db, user)
             if not allowed:
                 raise HTTPException(status_code=429, detail=message)
+            reserved = True
         
         # Validate files
         if not files or len(files) == 0:
@@ -476,10 +499,6 @@ async def process_images_to_pdf(
             jpeg_quality=jpeg_quality
         )
         
-        # Registrar uso de quota (se usuário logado)
-        if user:
-            quota_service.record_operation(db, user)
-        
         # Criar job ID para rastreamento
         job_id = str(uuid.uuid4())
         output_filename = f"images_combined_{job_id[:8]}.pdf"
@@ -514,7 +533,13 @@ async def process_images_to_pdf(
         )
         
     except HTTPException:
+        if reserved:
+            quota_service.release_operation(db, user)
         raise
     except Exception as e:
         logger.error(f"Images to PDF conversion failed: {str(e)}")
+        if reserved:
+            # The session may be in a failed state
+            db.rollback()
+            quota_service.release_operation(db, user)
         raise HTTPException(status_code=500, detail=f"Erro ao converter imagens: {str(e)}")
\ No newline at end of file
@@ -3,14 +3,45 @@ Billing service for Mercado Pago integration
 """
 import requests
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Optional, not a project dependency: without it (or without REDIS_URL)
+# webhook retries are deduplicated in-process only
+try:
+    import redis
+except ImportError:
+    redis = None
 
 from app.models import User, Subscription, Invoice, Coupon
 from app.config import settings
 from app.utils.security import verify_webhook_signature
 
+# Single-statement checkout activation used on PostgreSQL. Every CTE runs even
+# when not referenced by the final INSERT, so all writes commit atomically.
+_CREATE_SUBSCRIPTION_SQL = """
+WITH cancelled AS (
+    UPDATE subscriptions SET status = 'cancelled', updated_at = now()
+    WHERE user_id = :uid AND status = 'active'
+    RETURNING id
+), ins AS (
+    INSERT INTO subscriptions (user_id, plan, status, mp_subscription_id,
+                               current_period_start, current_period_end)
+    VALUES (:uid, :plan, 'active', :mp_id, :start, :end)
+    RETURNING id
+), upd_user AS (
+    UPDATE users SET plan = :plan, updated_at = now() WHERE id = :uid
+)
+INSERT INTO invoices (subscription_id, mp_payment_id, amount, status, due_date, paid_at)
+SELECT id, :mp_id, :amount, 'paid', :start, :now FROM ins
+RETURNING subscription_id
+"""
+
 class BillingService:
     """Service for handling billing and Mercado Pago integration"""
     
@@ -18,6 +49,11 @@ class BillingService:
         self.access_token = settings.MP_ACCESS_TOKEN
         self.webhook_secret = settings.MP_WEBHOOK_SECRET
         self.base_url = "https://api.mercadopago.com"
+        self.dedup_seconds = settings.MP_WEBHOOK_DEDUP_SECONDS
+        self._redis = redis.Redis.from_url(settings.REDIS_URL) if redis and settings.REDIS_URL else None
+        # In-process fallback when Redis is not configured: key -> expiry.
+        # Every entry gets the same TTL, so insertion order is expiry order
+        self._seen_payments: "OrderedDict[str, float]" = OrderedDict()
     
     def create_checkout_preference(self, user: User, plan: str, coupon_code: Optional[str] = None) -> Dict[str, Any]:
         """Create Mercado Pago checkout preference"""
@@ -77,8 +113,63 @@ class BillingService:
         """Verify Mercado Pago webhook signature"""
         return verify_webhook_signature(payload, signature, self.webhook_secret)
     
+    def _mark_payment_seen(self, payment_id: str) -> bool:
+        """Mark payment as seen; returns False if it was already seen"""
+        key = f"billing:mp:seen:{payment_id}"
+        if self._redis is not None:
+            try:
+                return bool(self._redis.set(key, "1", nx=True, ex=self.dedup_seconds))
+            except redis.RedisError:
+                pass  # Fall back to the in-process guard
+        
+        now = time.time()
+        # Evict expired entries from the oldest end so the map stays bounded
+        seen = self._seen_payments
+        while seen:
+            oldest_key, oldest_expiry = next(iter(seen.items()))
+            if oldest_expiry > now:
+                break
+            del seen[oldest_key]
+        
+        if key in seen:
+            return False
+        seen[key] = now + self.dedup_seconds
+        return True
+    
+    def _forget_payment(self, payment_id: str) -> None:
+        """Allow a payment to be processed again (e.g. after a failed attempt)"""
+        key = f"billing:mp:seen:{payment_id}"
+        self._seen_payments.pop(key, None)
+        if self._redis is not None:
+            try:
+                self._redis.delete(key)
+            except redis.RedisError:
+                pass
+    
     def process_payment_notification(self, db: Session, payment_id: str) -> bool:
-        """Process payment notification from Mercado Pago"""
+        """Process payment notification from Mercado Pago
+        
+        Commits the session itself: the seen-marker must only stay set once
+        the subscription is durably stored, or retries would be skipped.
+        """
+        # Mercado Pago retries webhooks: skip duplicates before any API/DB work
+        if not self._mark_payment_seen(payment_id):
+            return True
+        
+        try:
+            processed = self._process_payment(db, payment_id)
+            if processed:
+                db.commit()
+        except Exception:
+            self._forget_payment(payment_id)
+            raise
+        
+        if not processed:
+            self._forget_payment(payment_id)
+        return processed
+    
+    def _process_payment(self, db: Session, payment_id: str) -> bool:
+        """Fetch payment from Mercado Pago and activate the subscription"""
         # Get payment details from Mercado Pago
         headers = {
             "Authorization": f"Bearer {self.access_token}"
@@ -121,6 +212,14 @@ class BillingService:
     
     def create_subscription(self, db: Session, user: User, plan: str, payment_data: Dict[str, Any]) -> Subscription:
         """Create new subscription for user"""
+        start_date = date.today()
+        end_date = start_date + timedelta(days=30)  # Monthly subscription
+        
+        if db.get_bind().dialect.name == "postgresql":
+            return self._create_subscription_single_statement(
+                db, user, plan, payment_data, start_date, end_date
+            )
+        
         # Cancel existing subscriptions
         existing_subs = db.query(Subscription).filter(
             Subscription.user_id == user.id,
@@ -131,9 +230,6 @@ class BillingService:
             sub.status = "cancelled"
         
         # Create new subscription
-        start_date = date.today()
-        end_date = start_date + timedelta(days=30)  # Monthly subscription
-        
         subscription = Subscription(
             user_id=user.id,
             plan=plan,
@@ -144,6 +240,7 @@ class BillingService:
         )
         
         db.add(subscription)
+        db.flush()  # Assign subscription.id for the invoice
         
         # Update user plan
         user.plan = plan
@@ -159,11 +256,35 @@ class BillingService:
         )
         
         db.add(invoice)
-        db.commit()
-        db.refresh(subscription)
+        # Commit is owned by the caller's unit of work (see get_db)
+        db.flush()
         
         return subscription
     
+    def _create_subscription_single_statement(self, db: Session, user: User, plan: str,
+                                              payment_data: Dict[str, Any],
+                                              start_date: date, end_date: date) -> Subscription:
+        """Cancel old subscriptions, insert the new one, update the user and
+        record the invoice in one round-trip using data-modifying CTEs (PostgreSQL)"""
+        mp_id = payment_data.get("id")
+        mp_id = str(mp_id) if mp_id is not None else None
+        
+        subscription_id = db.execute(text(_CREATE_SUBSCRIPTION_SQL), {
+            "uid": user.id,
+            "plan": plan,
+            "mp_id": mp_id,
+            "start": start_date,
+            "end": end_date,
+            "amount": payment_data.get("transaction_amount", 0),
+            "now": datetime.now(),
+        }).scalar_one()
+        # Commit is owned by the caller's unit of work (see get_db)
+        
+        # Keep the in-memory user in sync without issuing another UPDATE
+        set_committed_value(user, "plan", plan)
+        
+        return db.get(Subscription, subscription_id)
+    
     def cancel_subscription(self, db: Session, subscription: Subscription) -> None:
         """Cancel subscription"""
         subscription.status = "cancelled"
@@ -171,7 +292,8 @@ class BillingService:
         # Revert user to free plan at the end of current period
         # This would typically be handled by a background job
         
-        db.commit()
+        # Commit is owned by the request-scoped session (see get_db)
+        db.flush()
     
     def get_user_subscription(self, db: Session, user: User) -> Optional[Subscription]:
         """Get user's active subscription"""
@@ -213,8 +335,8 @@ class BillingService:
         discount = amount * (coupon.discount_percent / 100)
         discounted_amount = amount - discount
         
-        # Update coupon usage
+        # Update coupon usage (committed by the request-scoped session)
         coupon.used_count += 1
-        db.commit()
+        db.flush()
         
         return discounted_amount
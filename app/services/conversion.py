@@ -2,15 +2,28 @@
 Comprehensive PDF conversion service with Office, image, and text conversion support
 """
 import os
+import io
 import tempfile
 import subprocess
 import logging
 import asyncio
+import functools
+import hashlib
+import html
+import inspect
+import json
+import re
+import atexit
+import mmap
+import threading
+import signal
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator, Union
 import uuid
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
 import shutil
 
 try:
@@ -39,6 +52,9 @@ try:
 except ImportError:
     pdfminer_extract_text = LAParams = None
 
+# Layout analysis settings are immutable; build them once
+PDFMINER_LAPARAMS = LAParams() if LAParams is not None else None
+
 try:
     import pytesseract
 except ImportError:
@@ -60,21 +76,831 @@ except ImportError:
     Presentation = None
 
 try:
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = PropertyValue = None
+
+try:
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
     from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.pagesizes import letter, A4, landscape
+    from reportlab.lib import colors
 except ImportError:
-    SimpleDocTemplate = Paragraph = Spacer = getSampleStyleSheet = letter = None
+    SimpleDocTemplate = Paragraph = Spacer = Table = TableStyle = PageBreak = None
+    getSampleStyleSheet = letter = A4 = landscape = colors = None
+
+try:
+    import img2pdf
+except ImportError:
+    img2pdf = None
+
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    # Loads the libturbojpeg shared library; fails when it is not installed
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+
+# Building the sample stylesheet parses every style; only read from it
+SAMPLE_STYLES = getSampleStyleSheet() if getSampleStyleSheet is not None else None
+
+# Deflate page streams (zlib, in C) and write reproducible output, so
+# identical inputs give byte-identical PDFs
+REPORTLAB_OPTIONS = {"pageCompression": 1, "invariant": 1}
+
+# Other reportlab values that are the same for every conversion
+if SimpleDocTemplate is not None:
+    LANDSCAPE_LETTER = landscape(letter)
+    XLSX_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+else:
+    LANDSCAPE_LETTER = XLSX_TABLE_STYLE = None
 
 from app.config import settings
-from app.pdf_compress import compress_pdf as compress_pdf_advanced
+from app.pdf_compress import compress_pdf as compress_pdf_advanced, compress_pdf_bytes
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever conversion output changes so stale cache entries are ignored
+CACHE_VERSION = "1"
+
+# OCR render scale (1.5 = 108 DPI); Tesseract gains little from larger pages
+OCR_ZOOM = 1.5
+
+# JPEG quality for rendered pages (PyMuPDF's previous default)
+JPEG_QUALITY = 95
+
+# pdf_to_images resolutions; requests snap to the nearest. Pixmap memory and
+# render time grow with dpi², and little gains from going past 300.
+IMAGE_DPI_STEPS = (72, 150, 200, 300)
+
+# pdf_to_pptx slide render scale (1.5 = 108 DPI; the slide shows the page at
+# about 60% of its size, so that is ~180 DPI as displayed)
+PPTX_ZOOM = 1.5
+
+# Pages per process-pool task when rendering pdf_to_pptx slides
+PPTX_RENDER_BATCH = 4
+
+# Images decoded at a time by images_to_pdf's Pillow path
+IMAGES_PDF_BATCH = 8
+
+# Rows per reportlab Table in xlsx_to_pdf; splitting one huge table across
+# pages re-lays-out the remainder on every page
+XLSX_TABLE_ROWS = 500
+
+# Largest size JPEG inputs are decoded at for images_to_pdf (A4 @ 300 DPI)
+JPEG_DRAFT_SIZE = (2480, 3508)
+
+# Written in place of the text when extraction finds nothing
+NO_TEXT_MESSAGE = "No text could be extracted from this PDF."
+
 class ConversionError(Exception):
     """Custom exception for conversion errors"""
     pass
 
+# LibreOffice export filters by target format; PDF depends on the source app
+LIBREOFFICE_FILTERS = {
+    "docx": "MS Word 2007 XML",
+    "xlsx": "Calc MS Excel 2007 XML",
+    "pptx": "Impress MS PowerPoint 2007 XML",
+    "odt": "writer8",
+}
+LIBREOFFICE_PDF_FILTERS = {
+    ".xls": "calc_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+    ".ods": "calc_pdf_Export",
+    ".csv": "calc_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".pptx": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+}
+
+def libreoffice_filter(input_path: str, target_format: str) -> str:
+    """Resolve the UNO export filter for a soffice-style target format"""
+    if ":" in target_format:
+        return target_format.split(":", 1)[1]
+    if target_format == "pdf":
+        return LIBREOFFICE_PDF_FILTERS.get(Path(input_path).suffix.lower(), "writer_pdf_Export")
+    if target_format not in LIBREOFFICE_FILTERS:
+        raise ConversionError(f"Unsupported LibreOffice target format: {target_format}")
+    return LIBREOFFICE_FILTERS[target_format]
+
+class LibreOfficeDaemon:
+    """
+    Long-lived headless LibreOffice listening on a UNO socket.
+    
+    Avoids paying soffice startup on every conversion. A single LibreOffice
+    instance is not safe for concurrent use, so calls are serialized.
+    """
+    
+    def __init__(self, profile_dir: Path, host: str = "127.0.0.1", port: int = 2002):
+        self.host = host
+        self.port = port
+        self.profile_dir = profile_dir
+        self.pidfile = profile_dir.with_suffix(".pid")
+        self.process: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+        self._desktop = None
+        # Set once soffice fails to start; the service then stops using daemons
+        self.unavailable = False
+        atexit.register(self.stop)
+    
+    @property
+    def connection_string(self) -> str:
+        return f"socket,host={self.host},port={self.port};urp;"
+    
+    def _connect(self):
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        context = resolver.resolve(f"uno:{self.connection_string}StarOffice.ComponentContext")
+        return context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+    
+    def _start(self, timeout: float = 30.0):
+        """Launch soffice and wait until the UNO socket accepts connections"""
+        self.stop()
+        try:
+            self.process = subprocess.Popen(
+                [
+                    "soffice", "--headless", "--invisible", "--nodefault",
+                    "--norestore", "--nologo",
+                    f"--accept={self.connection_string}",
+                    f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self.unavailable = True
+            raise ConversionError(f"LibreOffice daemon could not be spawned: {e}")
+        self.pidfile.write_text(str(self.process.pid))
+        
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.unavailable = True
+                raise ConversionError("LibreOffice daemon exited during startup")
+            try:
+                self._desktop = self._connect()
+                logger.info(f"LibreOffice daemon listening on {self.host}:{self.port}")
+                return
+            except Exception:
+                time.sleep(0.25)
+        self.unavailable = True
+        self.stop()
+        raise ConversionError("LibreOffice daemon did not start in time")
+    
+    def _get_desktop(self):
+        if self._desktop is None or self.process is None or self.process.poll() is not None:
+            self._start()
+        return self._desktop
+    
+    def convert(self, input_path: str, output_path: str, filter_name: str):
+        """Convert a single document through the running instance"""
+        with self.lock:
+            if self.unavailable:
+                raise ConversionError("LibreOffice daemon is unavailable")
+            desktop = self._get_desktop()
+            try:
+                component = desktop.loadComponentFromURL(
+                    Path(input_path).resolve().as_uri(), "_blank", 0,
+                    (self._property("Hidden", True),)
+                )
+                if component is None:
+                    raise ConversionError(f"LibreOffice could not open {input_path}")
+                try:
+                    component.storeToURL(
+                        Path(output_path).resolve().as_uri(),
+                        (self._property("FilterName", filter_name),)
+                    )
+                finally:
+                    component.close(True)
+            except ConversionError:
+                raise
+            except Exception:
+                # Any UNO error may leave the bridge or the instance in a bad
+                # state (crash, kill after a timeout); reconnect next time
+                self._desktop = None
+                raise
+    
+    def kill(self):
+        """Kill the instance without waiting for the lock.
+        
+        Used when a conversion times out: the blocked UNO call then fails
+        with a disposed bridge, and the next conversion starts a fresh
+        instance.
+        """
+        self._desktop = None
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+    
+    def stop(self):
+        """Terminate the daemon if we started one"""
+        self._desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+        self.pidfile.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _property(name: str, value: Any):
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        return prop
+
+# Office conversions: public method -> (blocking builder, label for errors)
+OFFICE_CONVERSIONS = {
+    "pdf_to_docx": ("_pdf_to_docx", "PDF to DOCX"),
+    "docx_to_pdf": ("_docx_to_pdf", "DOCX to PDF"),
+    "pdf_to_xlsx": ("_pdf_to_xlsx", "PDF to XLSX"),
+    "xlsx_to_pdf": ("_xlsx_to_pdf", "XLSX to PDF"),
+    "pdf_to_pptx": ("_pdf_to_pptx", "PDF to PPTX"),
+    "pptx_to_pdf": ("_pptx_to_pdf", "PPTX to PDF"),
+}
+
+def _signal_process_group(process, sig: int) -> None:
+    """Signal a process started with start_new_session=True and everything it spawned"""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+async def _terminate_process_group(process, grace: float = 2.0) -> None:
+    """SIGTERM the group so soffice can clean up, SIGKILL it if still alive after grace"""
+    _signal_process_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace)
+    except asyncio.TimeoutError:
+        _signal_process_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+# Shared worker pools, sized from CONVERSION_WORKERS (0 = one per CPU)
+CPU_WORKERS = settings.CONVERSION_WORKERS or os.cpu_count() or 1
+# PyMuPDF / PIL / Tesseract work
+CPU_EXECUTOR = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+# Worker processes for GIL-bound PyMuPDF work (rendering, OCR, split,
+# merge). Spawned rather than forked: forking a process that already
+# runs threads can deadlock the child. Processes start on first use.
+PROCESS_WORKERS = min(CPU_WORKERS, 8)
+PROCESS_EXECUTOR = ProcessPoolExecutor(
+    max_workers=PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+)
+atexit.register(CPU_EXECUTOR.shutdown, wait=False)
+atexit.register(PROCESS_EXECUTOR.shutdown, wait=False)
+
+def _sha256_file(path: str) -> str:
+    """SHA-256 of a file, hashed straight from an mmap of its contents"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+class PdfContext:
+    """
+    Lazily computed facts about one input file, shared by every stage of a job
+    so the file is hashed and parsed at most once.
+    
+    A fitz.Document is not thread-safe: hold `lock` while using `document`.
+    """
+    
+    def __init__(self, path: str, sha256: Optional[str] = None):
+        self.path = path
+        self.lock = threading.RLock()
+        self._stamp = self._file_stamp()
+        self._sha256 = sha256
+        self._document = None
+        self._page_count = None
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    @property
+    def stale(self) -> bool:
+        """True once the file on disk no longer matches what was parsed"""
+        return self._file_stamp() != self._stamp
+    
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = _sha256_file(self.path)
+        return self._sha256
+    
+    @property
+    def document(self):
+        if self._document is None:
+            self._document = fitz.open(self.path)
+        return self._document
+    
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            with self.lock:
+                self._page_count = len(self.document)
+        return self._page_count
+    
+    def close(self):
+        with self.lock:
+            if self._document is not None:
+                self._document.close()
+                self._document = None
+
+def _run_in(executor, fn, *args) -> "asyncio.Future":
+    """Await ``fn(*args)`` on one of the service's dedicated pools"""
+    return asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+def _snap_dpi(dpi) -> int:
+    """Clamp a requested resolution to IMAGE_DPI_STEPS, picking the nearest step"""
+    try:
+        dpi = int(dpi)
+    except (TypeError, ValueError):
+        raise ConversionError(f"Invalid DPI: {dpi}")
+    return min(IMAGE_DPI_STEPS, key=lambda step: abs(step - dpi))
+
+def _page_chunks(page_count: int, parts: int) -> List[range]:
+    """Split range(page_count) into at most `parts` contiguous, balanced ranges"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    chunks = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            chunks.append(range(start, end))
+        start = end
+    return chunks
+
+_gpu_jpeg_encode = None
+_gpu_jpeg_checked = False
+_gpu_jpeg_lock = threading.Lock()
+
+def _gpu_jpeg_encoder():
+    """JPEG encoder running on CUDA (nvjpeg via torchvision), or None.
+    
+    Only tried when GPU_JPEG_ENCODE is set; torch is imported lazily since
+    it is heavy and absent from most deployments.
+    """
+    global _gpu_jpeg_encode, _gpu_jpeg_checked
+    if _gpu_jpeg_checked:
+        return _gpu_jpeg_encode
+    with _gpu_jpeg_lock:
+        if _gpu_jpeg_checked:
+            return _gpu_jpeg_encode
+        if settings.GPU_JPEG_ENCODE:
+            try:
+                import torch
+                from torchvision.io import encode_jpeg
+                
+                if torch.cuda.is_available():
+                    def _encode(pix, quality: int = JPEG_QUALITY) -> bytes:
+                        pixels = torch.frombuffer(bytearray(pix.samples), dtype=torch.uint8)
+                        pixels = pixels.view(pix.height, pix.width, pix.n).permute(2, 0, 1)
+                        encoded = encode_jpeg(pixels.to("cuda", non_blocking=True), quality=quality)
+                        return encoded.cpu().numpy().tobytes()
+                    
+                    _gpu_jpeg_encode = _encode
+                    logger.info("Encoding JPEG pages on the GPU")
+                else:
+                    logger.warning("GPU_JPEG_ENCODE is set but CUDA is not available")
+            except ImportError:
+                logger.warning("GPU_JPEG_ENCODE is set but torch/torchvision are not installed")
+        _gpu_jpeg_checked = True
+        return _gpu_jpeg_encode
+
+def _atomic_write(final_path, writer, sync: bool = True) -> None:
+    """Write a file via a .part sibling so readers never see a partial output.
+    
+    ``writer`` receives the temporary path; once it returns the data is
+    fsynced (unless ``sync`` is False) and renamed over ``final_path``.
+    """
+    final_path = Path(final_path)
+    tmp_path = final_path.with_name(final_path.name + ".part")
+    try:
+        writer(tmp_path)
+        if sync:
+            try:
+                fd = os.open(tmp_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass  # fsync is not available everywhere (e.g. read-only handles on Windows)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+# Text-only PDFs laid out by MuPDF's Story engine (PyMuPDF >= 1.21)
+TEXT_PDF_CSS = "* {font-family: sans-serif; font-size: 11pt;} p {margin-bottom: 12pt;}"
+
+def _fitz_story_available() -> bool:
+    return fitz is not None and hasattr(fitz, "Story")
+
+def _write_text_pdf(path, sections: List[str], page_rect, margin: float) -> None:
+    """Write HTML sections as a PDF with MuPDF's C layout engine.
+    
+    Each section starts on a new page and flows onto as many pages as it
+    needs; text is wrapped natively instead of measured from Python.
+    """
+    where = page_rect + (margin, margin, -margin, -margin)
+    # Given a file object the writer always emits PDF; a path would have its
+    # format guessed from the extension (".part" while staging)
+    with open(path, "wb") as f:
+        writer = fitz.DocumentWriter(f)
+        try:
+            for section in sections:
+                story = fitz.Story(html=section, user_css=TEXT_PDF_CSS)
+                more = True
+                while more:
+                    device = writer.begin_page(page_rect)
+                    more, _ = story.place(where)
+                    story.draw(device)
+                    writer.end_page()
+        finally:
+            writer.close()
+
+def _html_paragraph(text: str) -> str:
+    return f"<p>{html.escape(text).replace(chr(10), '<br/>')}</p>"
+
+def _xlsx_table(header: List[str], rows: List[List[str]]):
+    """One styled xlsx_to_pdf table: the header row followed by ``rows``"""
+    table = Table([header] + rows)
+    table.setStyle(XLSX_TABLE_STYLE)
+    return table
+
+def _build_doc(doc_template, story, path) -> None:
+    """Build a reportlab document template into ``path``"""
+    doc_template.filename = str(path)
+    doc_template.build(story)
+
+def _encode_jpeg(pix, quality: int) -> bytes:
+    """JPEG-encode an RGB pixmap with the fastest encoder available.
+    
+    Order: GPU (when enabled), libjpeg-turbo via PyTurboJPEG, Pillow, MuPDF.
+    All use 4:2:0 chroma subsampling.
+    """
+    gpu_encode = _gpu_jpeg_encoder()
+    if gpu_encode is not None:
+        return gpu_encode(pix, quality)
+    if _turbojpeg is not None:
+        pixels = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+        return _turbojpeg.encode(pixels, quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+    if Image is not None:
+        buffer = io.BytesIO()
+        _pixmap_image(pix).save(buffer, format="JPEG", quality=quality, subsampling=2, optimize=False)
+        return buffer.getvalue()
+    return pix.tobytes(output="jpeg", jpg_quality=quality)
+
+def _render_page_range(pdf_path: str, start: int, stop: int, dpi: int, fmt: str, out_dir: str,
+                       jpeg_quality: int = JPEG_QUALITY) -> List[str]:
+    """Render pages [start, stop) of a PDF to image files.
+    
+    Runs in the service's process pool, so it must stay a picklable module-level
+    function and open the document itself.
+    """
+    doc = fitz.open(pdf_path)
+    image_paths = []
+    work_dir = Path(out_dir)
+    
+    # Get original filename for prefix
+    original_name = Path(pdf_path).stem
+    
+    # Encoded pages are written by a background thread while the next page
+    # renders. At most a few encoded pages wait in memory. Page files are
+    # short-lived job outputs, so they are renamed into place but not
+    # fsynced; durability is only paid for final artifacts.
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spill")
+    writes = deque()
+    try:
+        # Create matrix for DPI scaling
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+            
+            # Save image with original filename prefix
+            if fmt in ['jpg', 'jpeg']:
+                image_path = work_dir / f"{original_name}_page_{page_num + 1:03d}.jpg"
+                data = _encode_jpeg(pix, jpeg_quality)
+            else:
+                image_path = work_dir / f"{original_name}_page_{page_num + 1:03d}.png"
+                data = pix.tobytes(output="png")
+            
+            if len(writes) >= 4:
+                writes.popleft().result()
+            writes.append(writer.submit(
+                _atomic_write, image_path, functools.partial(Path.write_bytes, data=data), sync=False
+            ))
+            image_paths.append(str(image_path))
+        
+        for write in writes:
+            write.result()
+    finally:
+        writer.shutdown(wait=True)
+        doc.close()
+    return image_paths
+
+def _pixmap_image(pix) -> "Image.Image":
+    """RGB PIL image decoded straight from a pixmap's memory.
+    
+    Reading ``samples_mv`` skips the full ``bytes`` copy that ``pix.samples``
+    makes for every page.
+    """
+    return Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+
+def _bounded_map(executor, fn, items, window: int) -> Iterator[Any]:
+    """Like executor.map, but with at most ``window`` results pending.
+    
+    executor.map submits everything up front and holds every finished result
+    until it is consumed; this keeps a slow consumer from buffering a whole
+    document.
+    """
+    items = iter(items)
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            break
+    while pending:
+        yield pending.popleft().result()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            break
+
+def _render_png_range(pdf_path: str, pages: range, zoom: float) -> List[bytes]:
+    """Render a page range to PNG bytes. Runs in the service's process pool."""
+    doc = fitz.open(pdf_path)
+    try:
+        mat = fitz.Matrix(zoom, zoom)
+        return [
+            doc.load_page(page_num).get_pixmap(matrix=mat, alpha=False).tobytes("png")
+            for page_num in pages
+        ]
+    finally:
+        doc.close()
+
+def _create_ico(pdf_path: str, sizes: List[int], output_path: str) -> str:
+    """Build a multi-size ICO from the first page. Runs in the service's process pool."""
+    # Render the first page once at the largest icon size, keeping its
+    # aspect ratio, and centre it on a transparent square
+    largest = max(sizes)
+    doc = fitz.open(pdf_path)
+    try:
+        if len(doc) == 0:
+            raise ConversionError("No pages found in PDF")
+        page = doc.load_page(0)
+        scale = largest / max(page.rect.width, page.rect.height)
+        rendered = _pixmap_image(page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False))
+        square = Image.new("RGBA", (largest, largest), (0, 0, 0, 0))
+        square.paste(rendered, ((largest - rendered.width) // 2, (largest - rendered.height) // 2))
+    finally:
+        doc.close()
+    
+    # Each size is resampled from the previous, already small one; BOX
+    # avoids LANCZOS ringing on the tiniest frames
+    icons = []
+    prev = square
+    for size in sorted(set(sizes), reverse=True):
+        if size != prev.width:
+            resample = Image.Resampling.BOX if size <= 32 else Image.Resampling.LANCZOS
+            prev = prev.resize((size, size), resample)
+        icons.append(prev)
+    
+    # The ICO writer uses the supplied frame for each size and only
+    # downsamples sizes it was not given
+    _atomic_write(output_path, lambda tmp: icons[0].save(
+        str(tmp),
+        format='ICO',
+        sizes=[(size, size) for size in sizes],
+        append_images=icons[1:]
+    ))
+    return output_path
+
+def _tiff_bytes(images: List["Image.Image"]) -> bytes:
+    """Pack images into one multi-page TIFF, in memory"""
+    # Uncompressed: the TIFF only crosses a pipe, so LZW would be wasted CPU
+    tiff = io.BytesIO()
+    images[0].save(tiff, format="TIFF", save_all=True, append_images=images[1:])
+    return tiff.getvalue()
+
+def _ocr_tiff(tiff: bytes, page_count: int, lang: str = "por+eng") -> List[str]:
+    """OCR a multi-page TIFF with one tesseract run, returning text per page.
+    
+    Runs in a thread: the work happens in the tesseract process, so there is
+    nothing to gain from pickling the TIFF over to a worker process. The TIFF
+    goes to tesseract's stdin, so its startup and language model load are
+    paid once per TIFF.
+    """
+    result = subprocess.run(
+        [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", lang],
+        input=tiff, capture_output=True
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise ConversionError(f"tesseract exited with status {result.returncode}: {stderr}")
+    output = result.stdout.decode("utf-8", errors="replace")
+    
+    # Tesseract ends every page with a form feed
+    page_texts = output.split("\f")
+    return [page_texts[i] if i < len(page_texts) else "" for i in range(page_count)]
+
+def _write_splits(pdf_path: str, splits: List[Tuple[int, int, str]]) -> List[str]:
+    """Write each 0-based inclusive (start, end, output_path) page range of a PDF.
+    
+    Runs in the service's process pool.
+    """
+    if pikepdf is not None:
+        # Page slices share objects with the source, so untouched
+        # fonts and images are written out without re-encoding
+        with pikepdf.open(pdf_path) as src:
+            for start, end, output_path in splits:
+                with pikepdf.new() as dst:
+                    dst.pages.extend(src.pages[start:end + 1])
+                    _atomic_write(output_path, lambda tmp: dst.save(
+                        str(tmp),
+                        linearize=False,
+                        object_stream_mode=pikepdf.ObjectStreamMode.preserve,
+                        compress_streams=False,
+                        recompress_flate=False
+                    ))
+    else:
+        # Read the source once; each range reopens it from memory
+        pdf_bytes = Path(pdf_path).read_bytes()
+        for start, end, output_path in splits:
+            # select() trims a fresh copy of the source in place instead of
+            # copying pages (and re-parsing their fonts) into a new document;
+            # garbage=4 then drops what the range no longer references
+            split_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            try:
+                split_doc.select(list(range(start, end + 1)))
+                _atomic_write(output_path, lambda tmp: split_doc.save(str(tmp), garbage=4, deflate=True))
+            finally:
+                split_doc.close()
+    return [output_path for _, _, output_path in splits]
+
+def _merge_pdf_files(pdf_paths: List[str], output_path: str, compress: bool = False) -> str:
+    """Concatenate PDFs into output_path. Runs in the service's process pool.
+    
+    With ``compress`` the merged document is handed to the structural
+    compressor in memory, so only the final file touches the disk.
+    """
+    merged_doc = fitz.open()
+    
+    for pdf_path in pdf_paths:
+        try:
+            source_doc = fitz.open(pdf_path)
+            merged_doc.insert_pdf(source_doc)
+            source_doc.close()
+        except Exception as e:
+            logger.warning(f"Error merging {pdf_path}: {e}")
+            continue
+    
+    # garbage=3 merges duplicate objects (fonts/images shared by inputs);
+    # deflate and object streams keep the output small
+    save_options = dict(
+        garbage=3,
+        deflate=True,
+        deflate_images=True,
+        deflate_fonts=True,
+        use_objstms=1
+    )
+    if compress:
+        data = compress_pdf_bytes(merged_doc.tobytes(**save_options))
+        _atomic_write(output_path, lambda tmp: tmp.write_bytes(data))
+    else:
+        _atomic_write(output_path, lambda tmp: merged_doc.save(str(tmp), **save_options))
+    merged_doc.close()
+    
+    return str(output_path)
+
+# Characters of text packed into one reportlab Paragraph by extract_text_to_pdf
+TEXT_PARAGRAPH_CHARS = 2048
+
+# A paragraph: consecutive non-empty lines
+_PARAGRAPH_RE = re.compile(r"[^\n]+(?:\n[^\n]+)*")
+
+# One "N" or "N-M" entry of a page range list, with its trailing comma
+_RANGE_RE = re.compile(r"\s*(?:(\d+)\s*(?:-\s*(\d+)\s*)?)?(?:,|\Z)")
+
+def _parse_page_ranges(ranges: str, total_pages: int) -> List[Tuple[int, int]]:
+    """Parse "1-3,5,7-10" into 0-based, in-bounds (start, end) pairs, dropping repeats"""
+    page_ranges = []
+    seen = set()
+    pos, length = 0, len(ranges)
+    while pos < length:
+        match = _RANGE_RE.match(ranges, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Invalid page range: {ranges[pos:].split(',', 1)[0].strip()!r}")
+        pos = match.end()
+        first, last = match.group(1, 2)
+        if first is None:
+            continue  # empty entry, e.g. "1,,3"
+        start = int(first) - 1  # Convert to 0-based
+        end = int(last) - 1 if last is not None else start
+        if start < 0 or end >= total_pages or start > end:
+            continue
+        if (start, end) not in seen:
+            seen.add((start, end))
+            page_ranges.append((start, end))
+    return page_ranges
+
+def cached(op: str, *param_names: str):
+    """Serve a conversion from the content-addressed cache when possible.
+    
+    The first argument after ``self`` is the input path (or list of paths);
+    ``param_names`` lists the arguments that change the output. When the
+    caller passes no job_id one is assigned here, and the job's contexts are
+    released once the call returns.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            owns_job = bound.arguments.get("job_id") is None
+            if owns_job:
+                bound.arguments["job_id"] = str(uuid.uuid4())
+            job_id = bound.arguments["job_id"]
+            
+            try:
+                if not settings.CONVERSION_CACHE_ENABLED:
+                    return await method(*bound.args, **bound.kwargs)
+                return await _cached_call(self, method, bound, op, param_names)
+            finally:
+                if owns_job:
+                    # Nobody else can reuse contexts of a job id we made up
+                    self.release_job(job_id)
+        
+        return wrapper
+    return decorator
+
+async def _cached_call(service, method, bound, op: str, param_names: Tuple[str, ...]):
+    """Body of the @cached wrapper once arguments are bound"""
+    job_id = bound.arguments["job_id"]
+    inputs = list(bound.arguments.values())[1]
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    if not all(isinstance(item, (str, os.PathLike)) for item in inputs):
+        # In-memory inputs (e.g. PIL images) have no file to hash
+        return await method(*bound.args, **bound.kwargs)
+    params = {name: bound.arguments[name] for name in param_names}
+    work_dir = service._get_work_dir(job_id)
+    
+    try:
+        key = await asyncio.to_thread(service._cache_key, inputs, op, params, job_id)
+        hit = await asyncio.to_thread(service._cache_fetch, key, work_dir)
+    except OSError as e:
+        logger.warning(f"Conversion cache lookup failed: {e}")
+        return await method(*bound.args, **bound.kwargs)
+    
+    if hit is not None:
+        logger.info(f"Conversion cache hit for {op}")
+        return hit
+    
+    result = await method(*bound.args, **bound.kwargs)
+    if job_id in service.degraded_jobs:
+        # A fallback produced it; a later call may do better
+        service.degraded_jobs.discard(job_id)
+        logger.info(f"Not caching degraded {op} result")
+        return result
+    try:
+        await asyncio.to_thread(service._cache_store, key, result)
+    except OSError as e:
+        logger.warning(f"Conversion cache store failed: {e}")
+    return result
+
+
 class ConversionService:
     """
     Comprehensive PDF conversion service supporting:
@@ -85,10 +911,71 @@ class ConversionService:
     """
     
     def __init__(self):
-        self.temp_dir = Path(tempfile.gettempdir()) / "hubpdf_conversions"
-        self.temp_dir.mkdir(exist_ok=True)
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        temp_root = settings.CONVERSION_TEMP_DIR or tempfile.gettempdir()
+        self.temp_dir = Path(temp_root) / "hubpdf_conversions"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = self.temp_dir / "cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        self.contexts: Dict[str, Dict[str, PdfContext]] = {}
+        # Jobs whose last conversion fell back to a degraded path; their
+        # results are not cached
+        self.degraded_jobs: Set[str] = set()
+        if fitz is not None:
+            # Malformed inputs are common; don't echo every MuPDF warning to stderr
+            fitz.TOOLS.mupdf_display_errors(False)
+            if hasattr(fitz.TOOLS, "mupdf_display_warnings"):  # PyMuPDF >= 1.21
+                fitz.TOOLS.mupdf_display_warnings(False)
+        # One pool per workload class, so a queue of soffice jobs cannot hold
+        # up a cheap text extraction
+        # Spawned soffice processes each need their own user profile, or they
+        # contend for the profile lock; one worker per profile
+        office_slots = max(1, settings.LIBREOFFICE_PROFILES)
+        self.office_profiles: "asyncio.Queue[Path]" = asyncio.Queue()
+        for i in range(office_slots):
+            self.office_profiles.put_nowait(self.temp_dir / f"lo_profile_{i}")
+        # Blocking UNO calls into the LibreOffice daemon
+        self.office_executor = ThreadPoolExecutor(max_workers=office_slots, thread_name_prefix="lo")
+        atexit.register(self.office_executor.shutdown, wait=False)
+        # CPU pools are process-wide, shared by every service instance
+        # pikepdf, Ghostscript and disk-bound work goes to asyncio.to_thread:
+        # the default executor is already sized min(32, cpus + 4)
+        self.cpu_executor = CPU_EXECUTOR
+        self.process_executor = PROCESS_EXECUTOR
+        self.process_workers = PROCESS_WORKERS
+        self.office_semaphore = asyncio.Semaphore(office_slots)
+        # Warm LibreOffice instances, one per slot; each needs its own port and
+        # user profile to convert in parallel
+        self.office_daemons: Optional["asyncio.Queue[LibreOfficeDaemon]"] = None
+        if uno is not None and settings.LIBREOFFICE_DAEMON:
+            self.office_daemons = asyncio.Queue()
+            for i in range(office_slots):
+                # Started lazily on their first conversion
+                self.office_daemons.put_nowait(LibreOfficeDaemon(
+                    self.temp_dir / f"lo_profile_uno_{i}", port=settings.LIBREOFFICE_UNO_PORT + i
+                ))
         
+    def get_context(self, job_id: str, path: str) -> PdfContext:
+        """Shared per-job context for an input file"""
+        job_contexts = self.contexts.setdefault(job_id, {})
+        context = job_contexts.get(path)
+        if context is not None and context.stale:
+            # Rewritten in place by an earlier stage; drop the old parse
+            context.close()
+            context = None
+        if context is None:
+            context = job_contexts[path] = PdfContext(path)
+        return context
+    
+    def register_input(self, job_id: str, path: str, sha256: Optional[str] = None):
+        """Record an uploaded input, with its hash if already known at ingest"""
+        self.contexts.setdefault(job_id, {})[path] = PdfContext(path, sha256)
+    
+    def release_job(self, job_id: str):
+        """Close any documents held open for a job"""
+        for context in self.contexts.pop(job_id, {}).values():
+            context.close()
+        self.degraded_jobs.discard(job_id)
+    
     def _get_work_dir(self, job_id: str) -> Path:
         """Create and return a unique working directory for the job"""
         work_dir = self.temp_dir / job_id
@@ -97,20 +984,247 @@ class ConversionService:
         
     def _cleanup_work_dir(self, work_dir: Path):
         """Clean up the working directory"""
+        # Work dirs are named after the job; close its documents first
+        self.release_job(work_dir.name)
         try:
             if work_dir.exists():
-                shutil.rmtree(work_dir)
+                # Renaming is one syscall and frees the job's path at once; the
+                # per-file unlinks happen off the caller's thread (often the
+                # event loop). Anything left behind is caught by sweep_work_dirs.
+                trash = work_dir.with_name(f".trash-{work_dir.name}-{uuid.uuid4().hex[:8]}")
+                os.rename(work_dir, trash)
+                threading.Thread(
+                    target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True},
+                    name="workdir-cleanup", daemon=True
+                ).start()
         except Exception as e:
             logger.warning(f"Failed to cleanup work directory {work_dir}: {e}")
     
+    def sweep_work_dirs(self, ttl_seconds: int, keep: Optional[set] = None) -> int:
+        """Delete job work directories untouched for ttl_seconds.
+        
+        Jobs with open contexts and the ids in ``keep`` are left alone, as are
+        the cache and LibreOffice profile directories. Returns the number of
+        directories removed.
+        """
+        keep = set(keep or ()) | set(self.contexts) | {self.cache_dir.name}
+        cutoff = time.time() - ttl_seconds
+        removed = 0
+        with os.scandir(self.temp_dir) as entries:
+            for entry in entries:
+                if entry.name in keep or entry.name.startswith("lo_profile"):
+                    continue
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                        continue
+                except OSError:
+                    continue
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+    
+    def evict_cache(self, max_bytes: int) -> int:
+        """Drop least recently used cache entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                # Dot-prefixed directories are in-flight staging areas
+                if entry.name.startswith(".") or not entry.is_dir(follow_symlinks=False):
+                    continue
+                size = 0
+                try:
+                    with os.scandir(entry.path) as files:
+                        for f in files:
+                            size += f.stat(follow_symlinks=False).st_size
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+                entries.append((mtime, size, entry.path))
+                total += size
+        
+        removed = 0
+        for mtime, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+    
+    # Content-addressed conversion cache
+    def _cache_key(self, input_paths: List[str], op: str, params: Dict[str, Any], job_id: str) -> str:
+        """Hash input contents together with the operation and its parameters"""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}:{op}:".encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        digest.update(json.dumps(self._cache_environment(), sort_keys=True).encode())
+        for input_path in input_paths:
+            # Output names derive from the input stem, so it is part of the key
+            digest.update(f":{Path(input_path).stem}:".encode())
+            digest.update(self.get_context(job_id, input_path).sha256.encode())
+        return digest.hexdigest()
+    
+    def _cache_environment(self) -> Dict[str, Any]:
+        """Settings and installed tools that change conversion output"""
+        if self.office_daemons is not None:
+            office = "daemon"
+        elif shutil.which("soffice") is not None:
+            office = "soffice"
+        else:
+            office = "python"
+        return {
+            "office": office,
+            "ocr": pytesseract is not None,
+            "ocr_lang": settings.OCR_LANG,
+            "ocr_max_pages": settings.OCR_MAX_PAGES,
+            "pdfminer_max_pages": settings.PDFMINER_MAX_PAGES,
+            "gpu_jpeg": settings.GPU_JPEG_ENCODE,
+        }
+    
+    def _cache_fetch(self, key: str, work_dir: Path) -> Any:
+        """Link cached artifacts into work_dir and return the stored result, or None"""
+        entry = self.cache_dir / key
+        manifest_path = entry / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        
+        for name in manifest["files"]:
+            target = work_dir / name
+            if target.exists():
+                continue
+            try:
+                os.link(entry / name, target)
+            except OSError:
+                shutil.copy2(entry / name, target)
+        
+        os.utime(entry)  # Track recency for eviction
+        return self._resolve_cached_result(manifest["result"], work_dir)
+    
+    def _cache_store(self, key: str, result: Any):
+        """Atomically publish the outputs of a conversion into the cache"""
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+        
+        paths = self._result_paths(result)
+        if not paths:
+            return
+        
+        staging = self.cache_dir / f".{key}.{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            for path in paths:
+                try:
+                    os.link(path, staging / path.name)
+                except OSError:
+                    shutil.copy2(path, staging / path.name)
+            
+            manifest = {
+                "files": [path.name for path in paths],
+                "result": self._relativize_result(result),
+            }
+            with open(staging / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not entry.exists():
+                raise
+    
+    @staticmethod
+    def _result_paths(result: Any) -> List[Path]:
+        """Output files referenced by a conversion result"""
+        if isinstance(result, str):
+            return [Path(result)]
+        if isinstance(result, list):
+            return [Path(p) for p in result]
+        if isinstance(result, dict) and result.get("output_path"):
+            return [Path(result["output_path"])]
+        return []
+    
+    @staticmethod
+    def _relativize_result(result: Any) -> Any:
+        """Replace absolute output paths by file names for the manifest"""
+        if isinstance(result, str):
+            return Path(result).name
+        if isinstance(result, list):
+            return [Path(p).name for p in result]
+        result = dict(result)
+        result["output_path"] = Path(result["output_path"]).name
+        return result
+    
+    @staticmethod
+    def _resolve_cached_result(result: Any, work_dir: Path) -> Any:
+        """Inverse of _relativize_result for the current job's work_dir"""
+        if isinstance(result, str):
+            return str(work_dir / result)
+        if isinstance(result, list):
+            return [str(work_dir / name) for name in result]
+        result = dict(result)
+        result["output_path"] = str(work_dir / result["output_path"])
+        return result
+    
     def _get_original_filename_with_suffix(self, file_path: str, suffix: str, new_ext: str) -> str:
         """Get filename preserving original name with suffix"""
         file_path = Path(file_path)
         original_stem = file_path.stem
         return f"{original_stem}_{suffix}.{new_ext}"
     
-    def _run_libreoffice_conversion(self, input_path: str, output_dir: str, target_format: str, timeout: int = 60) -> str:
+    async def _daemon_convert(self, input_path: str, output_path: str, target_format: str):
+        """Convert one file on the next free warm LibreOffice instance"""
+        daemons = self.office_daemons
+        daemon = await daemons.get()
+        try:
+            # The UNO calls have no timeout of their own; on expiry the
+            # instance is killed so the worker thread and daemon come back
+            await asyncio.wait_for(
+                _run_in(
+                    self.office_executor, daemon.convert,
+                    input_path, output_path, libreoffice_filter(input_path, target_format)
+                ),
+                timeout=settings.CONVERSION_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            daemon.kill()
+            raise ConversionError("LibreOffice conversion timed out")
+        finally:
+            if daemon.unavailable and self.office_daemons is not None:
+                # soffice cannot be started here; stop routing work to daemons
+                logger.warning("LibreOffice daemon unavailable, using soffice/Python fallbacks")
+                self.office_daemons = None
+            daemons.put_nowait(daemon)
+    
+    async def _run_libreoffice_conversion(self, input_path: str, output_dir: str, target_format: str, timeout: int = 60) -> str:
         """Run LibreOffice headless conversion with timeout"""
+        if self.office_daemons is not None:
+            output_ext = target_format.split(":", 1)[0]
+            output_path = Path(output_dir) / f"{Path(input_path).stem}.{output_ext}"
+            try:
+                await self._daemon_convert(input_path, str(output_path), target_format)
+                return str(output_path)
+            except Exception as e:
+                logger.warning(f"LibreOffice daemon conversion failed, spawning soffice: {e}")
+        
+        outputs = await self._run_libreoffice_batch([input_path], output_dir, target_format, timeout)
+        return outputs[input_path]
+    
+    async def _run_libreoffice_batch(self, input_paths: List[str], output_dir: str, target_format: str,
+                                     timeout: int = 60) -> Dict[str, str]:
+        """Convert several files with a single soffice process
+        
+        soffice accepts multiple inputs, so startup is paid once per batch.
+        The process is awaited on the event loop, so no thread is parked
+        while it runs. Returns a mapping of input path -> output path.
+        """
+        # Concurrent soffice processes must not share a user profile
+        profile = await self.office_profiles.get()
         try:
             cmd = [
                 "soffice", 
@@ -119,395 +1233,555 @@ class ConversionService:
                 "--nodefault",
                 "--norestore",
                 "--nologo",
+                f"-env:UserInstallation={profile.as_uri()}",
                 f"--convert-to", target_format,
                 f"--outdir", output_dir,
-                input_path
+                *input_paths
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=output_dir
+            # Own session, so a timeout can kill exactly this soffice and its children
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=output_dir,
+                start_new_session=True
             )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=timeout * len(input_paths)
+                )
+            except asyncio.TimeoutError:
+                await _terminate_process_group(process)
+                await process.communicate()
+                raise ConversionError("LibreOffice conversion timed out")
             
-            if result.returncode != 0:
-                raise ConversionError(f"LibreOffice conversion failed: {result.stderr}")
+            if process.returncode != 0:
+                raise ConversionError(
+                    f"LibreOffice conversion failed: {stderr.decode(errors='replace')}"
+                )
                 
-            # Find the output file
-            input_stem = Path(input_path).stem
-            output_files = list(Path(output_dir).glob(f"{input_stem}.*"))
-            
-            if not output_files:
-                raise ConversionError("LibreOffice conversion produced no output file")
+            # Find the output files (soffice names them <input stem>.<ext>)
+            output_ext = target_format.split(":", 1)[0]
+            outputs = {}
+            for input_path in input_paths:
+                output_path = Path(output_dir) / f"{Path(input_path).stem}.{output_ext}"
+                if not output_path.exists():
+                    raise ConversionError(f"LibreOffice conversion produced no output file for {Path(input_path).name}")
+                outputs[input_path] = str(output_path)
                 
-            return str(output_files[0])
+            return outputs
             
-        except subprocess.TimeoutExpired:
-            # Kill any hanging soffice processes
-            subprocess.run(["pkill", "-f", "soffice"], capture_output=True)
-            raise ConversionError("LibreOffice conversion timed out")
         except FileNotFoundError:
             raise ConversionError("LibreOffice not found. Please install libreoffice package.")
+        finally:
+            self.office_profiles.put_nowait(profile)
     
-    # Office format conversions
-    async def pdf_to_docx(self, pdf_path: str, job_id: str = None) -> str:
-        """Convert PDF to DOCX using Python libraries"""
-        if Document is None:
-            raise ConversionError("python-docx not available. Please install python-docx package.")
+    def _libreoffice_available(self) -> bool:
+        """Whether a warm daemon or an soffice binary can run conversions"""
+        return self.office_daemons is not None or shutil.which("soffice") is not None
+    
+    @staticmethod
+    def _distinct_stems(input_paths: List[str], work_dir: Path) -> Tuple[List[str], List[str]]:
+        """Give every input a distinct stem, since outputs are named after it
+        
+        Later inputs whose stem repeats an earlier one are linked into
+        ``work_dir/inputs`` as ``<stem>_<n><suffix>``. Returns the paths to
+        convert and their stems, in input order.
+        """
+        used = {Path(p).stem for p in input_paths}
+        seen = set()
+        paths, stems = [], []
+        for path in input_paths:
+            source = Path(path)
+            stem = source.stem
+            if stem in seen:
+                n = 2
+                while f"{source.stem}_{n}" in used:
+                    n += 1
+                stem = f"{source.stem}_{n}"
+                used.add(stem)
+                staging = work_dir / "inputs"
+                staging.mkdir(exist_ok=True)
+                staged = staging / f"{stem}{source.suffix}"
+                try:
+                    os.link(source, staged)
+                except OSError:
+                    shutil.copyfile(source, staged)
+                path = str(staged)
+            seen.add(stem)
+            paths.append(path)
+            stems.append(stem)
+        return paths, stems
+    
+    @staticmethod
+    def _rename_output(output_path: str, work_dir: Path, name: str) -> str:
+        """Expose a conversion output as work_dir/name"""
+        target = work_dir / name
+        if Path(output_path) != target:
+            try:
+                os.replace(output_path, target)
+            except OSError:
+                # e.g. a cache-linked file shared with another input
+                shutil.copyfile(output_path, target)
+        return str(target)
+    
+    async def convert_many(self, input_paths: List[str], target_format: str, job_id: str = None) -> List[str]:
+        """Convert several documents with LibreOffice, amortizing startup across batches
+        
+        Outputs are named ``<stem>_to_<ext>.<ext>`` like the single-file
+        conversions; inputs sharing a stem get ``_2``, ``_3``... suffixes.
+        """
+        if not input_paths:
+            raise ConversionError("No input files provided")
+        
         if job_id is None:
             job_id = str(uuid.uuid4())
             
         work_dir = self._get_work_dir(job_id)
+        output_ext = target_format.split(":", 1)[0]
+        batch_size = max(1, settings.LIBREOFFICE_BATCH_SIZE)
+        
+        async def _run_batch(batch: List[str]) -> Dict[str, str]:
+            if self.office_daemons is not None:
+                # Warm instances: no startup cost to amortize; files spread
+                # over the free daemons
+                outputs = await asyncio.gather(*(
+                    self._run_libreoffice_conversion(path, str(work_dir), target_format)
+                    for path in batch
+                ))
+                return dict(zip(batch, outputs))
+            # One soffice per user profile at a time
+            async with self.office_semaphore:
+                return await self._run_libreoffice_batch(batch, str(work_dir), target_format)
         
         try:
-            def _extract_and_create_docx():
-                import pdfplumber
-                
-                # Create new DOCX document
-                doc = Document()
-                
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page_num, page in enumerate(pdf.pages):
-                        text = page.extract_text()
-                        if text:
-                            # Add page heading
-                            if page_num > 0:
-                                doc.add_page_break()
-                            doc.add_heading(f'Page {page_num + 1}', level=2)
-                            # Add text content
-                            doc.add_paragraph(text)
-                
-                # Save with original filename + suffix
-                output_filename = self._get_original_filename_with_suffix(pdf_path, "to_docx", "docx")
-                output_path = work_dir / output_filename
-                doc.save(str(output_path))
-                return str(output_path)
-            
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _extract_and_create_docx)
-            return output_path
-            
+            # soffice writes <stem>.<ext>, so stems must not collide
+            paths, stems = await asyncio.to_thread(self._distinct_stems, input_paths, work_dir)
+            batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+            results = await asyncio.gather(*(_run_batch(batch) for batch in batches))
+            outputs = {}
+            for result in results:
+                outputs.update(result)
+            return [
+                self._rename_output(outputs[path], work_dir, f"{stem}_to_{output_ext}.{output_ext}")
+                for path, stem in zip(paths, stems)
+            ]
         except Exception as e:
             self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"PDF to DOCX conversion failed: {str(e)}")
+            raise ConversionError(f"Batch conversion failed: {str(e)}")
     
-    async def docx_to_pdf(self, docx_path: str, job_id: str = None) -> str:
-        """Convert DOCX to PDF using Python libraries"""
-        if Document is None or SimpleDocTemplate is None:
-            raise ConversionError("Required libraries not available. Please install python-docx and reportlab.")
+    async def docx_to_pdf_many(self, docx_paths: List[str], job_id: str = None) -> List[str]:
+        """Convert several DOCX files to PDF, in input order
+        
+        With LibreOffice, one soffice run converts a whole batch (or the
+        daemons convert them back to back). Without it, or if it fails, each
+        file goes through the Python docx_to_pdf builder.
+        """
         if job_id is None:
             job_id = str(uuid.uuid4())
-            
-        work_dir = self._get_work_dir(job_id)
         
-        try:
-            def _convert_docx_to_pdf():
-                # Read DOCX content
-                doc = Document(docx_path)
-                
-                # Create PDF with reportlab
-                output_filename = self._get_original_filename_with_suffix(docx_path, "to_pdf", "pdf")
-                output_path = work_dir / output_filename
-                
-                pdf_doc = SimpleDocTemplate(str(output_path), pagesize=letter)
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Extract text from DOCX paragraphs
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        p = Paragraph(paragraph.text, styles['Normal'])
-                        story.append(p)
-                        story.append(Spacer(1, 12))
-                
-                if not story:
-                    # Add a placeholder if no content
-                    story.append(Paragraph("Document converted from DOCX", styles['Normal']))
-                
-                pdf_doc.build(story)
-                return str(output_path)
-            
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _convert_docx_to_pdf)
-            return output_path
-            
-        except Exception as e:
-            self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"DOCX to PDF conversion failed: {str(e)}")
+        if self._libreoffice_available():
+            try:
+                return await self.convert_many(docx_paths, "pdf", job_id)
+            except ConversionError as e:
+                logger.warning(f"LibreOffice batch conversion failed, using Python fallback: {e}")
+        
+        work_dir = self._get_work_dir(job_id)
+        paths, stems = await asyncio.to_thread(self._distinct_stems, docx_paths, work_dir)
+        outputs = []
+        for path, stem in zip(paths, stems):
+            result = await self.docx_to_pdf(path, job_id)
+            outputs.append(self._rename_output(result, work_dir, f"{stem}_to_pdf.pdf"))
+        return outputs
+    
+    # Office format conversions
+    @cached("pdf_to_docx")
+    async def pdf_to_docx(self, pdf_path: str, job_id: str = None) -> str:
+        """Convert PDF to DOCX using Python libraries"""
+        if Document is None:
+            raise ConversionError("python-docx not available. Please install python-docx package.")
+        return await self._office_convert("pdf_to_docx", pdf_path, job_id)
     
+    @cached("docx_to_pdf")
+    async def docx_to_pdf(self, docx_path: str, job_id: str = None) -> str:
+        """Convert DOCX to PDF using Python libraries"""
+        if Document is None or (SimpleDocTemplate is None and not _fitz_story_available()):
+            raise ConversionError("Required libraries not available. Please install python-docx and pymupdf or reportlab.")
+        return await self._office_convert("docx_to_pdf", docx_path, job_id)
+    
+    @cached("pdf_to_xlsx")
     async def pdf_to_xlsx(self, pdf_path: str, job_id: str = None) -> str:
         """Convert PDF to XLSX using Python libraries"""
         if Workbook is None:
             raise ConversionError("openpyxl not available. Please install openpyxl package.")
-        if job_id is None:
-            job_id = str(uuid.uuid4())
-            
-        work_dir = self._get_work_dir(job_id)
-        
-        try:
-            def _extract_and_create_xlsx():
-                import pdfplumber
-                
-                # Create new Excel workbook
-                wb = Workbook()
-                
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page_num, page in enumerate(pdf.pages):
-                        # Create sheet for each page
-                        if page_num == 0:
-                            ws = wb.active
-                            ws.title = f"Page {page_num + 1}"
-                        else:
-                            ws = wb.create_sheet(title=f"Page {page_num + 1}")
-                        
-                        # Extract tables if available
-                        tables = page.extract_tables()
-                        if tables:
-                            row_offset = 1
-                            for table in tables:
-                                for row in table:
-                                    for col_idx, cell in enumerate(row):
-                                        ws.cell(row=row_offset, column=col_idx + 1, value=cell)
-                                    row_offset += 1
-                                row_offset += 1  # Add space between tables
-                        else:
-                            # Extract text if no tables
-                            text = page.extract_text()
-                            if text:
-                                lines = text.split('\n')
-                                for row_idx, line in enumerate(lines, start=1):
-                                    ws.cell(row=row_idx, column=1, value=line)
-                
-                # Save with original filename + suffix
-                output_filename = self._get_original_filename_with_suffix(pdf_path, "to_xlsx", "xlsx")
-                output_path = work_dir / output_filename
-                wb.save(str(output_path))
-                return str(output_path)
-            
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _extract_and_create_xlsx)
-            return output_path
-            
-        except Exception as e:
-            self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"PDF to XLSX conversion failed: {str(e)}")
+        return await self._office_convert("pdf_to_xlsx", pdf_path, job_id)
     
+    @cached("xlsx_to_pdf")
     async def xlsx_to_pdf(self, xlsx_path: str, job_id: str = None) -> str:
         """Convert XLSX to PDF using Python libraries"""
         if load_workbook is None or SimpleDocTemplate is None:
             raise ConversionError("Required libraries not available. Please install openpyxl and reportlab.")
-        if job_id is None:
-            job_id = str(uuid.uuid4())
-            
-        work_dir = self._get_work_dir(job_id)
-        
-        try:
-            def _convert_xlsx_to_pdf():
-                from reportlab.lib import colors
-                from reportlab.lib.pagesizes import letter, landscape
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, PageBreak
-                from reportlab.lib.styles import getSampleStyleSheet
-                
-                # Read Excel content
-                wb = load_workbook(xlsx_path, data_only=True)
-                
-                # Create PDF with reportlab
-                output_filename = self._get_original_filename_with_suffix(xlsx_path, "to_pdf", "pdf")
-                output_path = work_dir / output_filename
-                
-                pdf_doc = SimpleDocTemplate(str(output_path), pagesize=landscape(letter))
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Process each sheet
-                for sheet_name in wb.sheetnames:
-                    ws = wb[sheet_name]
-                    
-                    # Add sheet title
-                    story.append(Paragraph(f"<b>{sheet_name}</b>", styles['Heading1']))
-                    
-                    # Extract data from sheet
-                    data = []
-                    for row in ws.iter_rows(values_only=True):
-                        data.append([str(cell) if cell is not None else "" for cell in row])
-                    
-                    if data:
-                        # Create table
-                        table = Table(data)
-                        table.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 10),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                        ]))
-                        story.append(table)
-                    
-                    story.append(PageBreak())
-                
-                if not story:
-                    story.append(Paragraph("Empty Excel document", styles['Normal']))
-                
-                pdf_doc.build(story)
-                return str(output_path)
-            
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _convert_xlsx_to_pdf)
-            return output_path
-            
-        except Exception as e:
-            self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"XLSX to PDF conversion failed: {str(e)}")
+        return await self._office_convert("xlsx_to_pdf", xlsx_path, job_id)
     
+    @cached("pdf_to_pptx")
     async def pdf_to_pptx(self, pdf_path: str, job_id: str = None) -> str:
         """Convert PDF to PPTX using Python libraries"""
         if Presentation is None or fitz is None:
             raise ConversionError("Required libraries not available. Please install python-pptx and pymupdf.")
+        return await self._office_convert("pdf_to_pptx", pdf_path, job_id)
+    
+    @cached("pptx_to_pdf")
+    async def pptx_to_pdf(self, pptx_path: str, job_id: str = None) -> str:
+        """Convert PPTX to PDF using Python libraries"""
+        if Presentation is None or Image is None or (SimpleDocTemplate is None and not _fitz_story_available()):
+            raise ConversionError("Required libraries not available. Please install python-pptx, pillow, and pymupdf or reportlab.")
+        return await self._office_convert("pptx_to_pdf", pptx_path, job_id)
+    
+    async def _office_convert(self, op: str, input_path: str, job_id: str = None) -> str:
+        """Run one of the Office format conversions listed in OFFICE_CONVERSIONS"""
+        builder_name, label = OFFICE_CONVERSIONS[op]
         if job_id is None:
             job_id = str(uuid.uuid4())
             
         work_dir = self._get_work_dir(job_id)
         
         try:
-            def _convert_pdf_to_pptx():
-                from pptx.util import Inches
-                
-                # Create new PowerPoint presentation
-                prs = Presentation()
-                prs.slide_width = Inches(10)
-                prs.slide_height = Inches(7.5)
-                
-                # Convert each PDF page to image and add to presentation
-                doc = fitz.open(pdf_path)
-                
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    
-                    # Convert page to image
-                    mat = fitz.Matrix(2, 2)  # 2x zoom for better quality
-                    pix = page.get_pixmap(matrix=mat, alpha=False)
-                    
-                    # Save temp image
-                    img_path = work_dir / f"temp_page_{page_num}.png"
-                    pix.save(str(img_path))
-                    
-                    # Add blank slide
-                    blank_slide_layout = prs.slide_layouts[6]  # Blank layout
-                    slide = prs.slides.add_slide(blank_slide_layout)
-                    
-                    # Add image to slide
-                    left = Inches(0.5)
-                    top = Inches(0.5)
-                    height = Inches(6.5)
-                    slide.shapes.add_picture(str(img_path), left, top, height=height)
-                    
-                    # Clean up temp image
-                    img_path.unlink(missing_ok=True)
-                
-                doc.close()
-                
-                # Save with original filename + suffix
-                output_filename = self._get_original_filename_with_suffix(pdf_path, "to_pptx", "pptx")
-                output_path = work_dir / output_filename
-                prs.save(str(output_path))
-                return str(output_path)
+            if op.endswith("_to_pdf") and self.office_daemons is not None:
+                # LibreOffice keeps the original layout and formatting; the
+                # reportlab builders only recover text and tables
+                output_path = work_dir / self._get_original_filename_with_suffix(input_path, "to_pdf", "pdf")
+                try:
+                    await self._daemon_convert(input_path, str(output_path), "pdf")
+                    return str(output_path)
+                except Exception as e:
+                    logger.warning(f"LibreOffice daemon {label} failed, using Python fallback: {e}")
+                    self.degraded_jobs.add(job_id)
             
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _convert_pdf_to_pptx)
-            return output_path
+            return await _run_in(
+                self.cpu_executor, getattr(self, builder_name), input_path, work_dir, job_id
+            )
             
         except Exception as e:
             self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"PDF to PPTX conversion failed: {str(e)}")
+            raise ConversionError(f"{label} conversion failed: {str(e)}")
     
-    async def pptx_to_pdf(self, pptx_path: str, job_id: str = None) -> str:
-        """Convert PPTX to PDF using Python libraries"""
-        if Presentation is None or Image is None or SimpleDocTemplate is None:
-            raise ConversionError("Required libraries not available. Please install python-pptx, pillow, and reportlab.")
-        if job_id is None:
-            job_id = str(uuid.uuid4())
+    def _pdf_to_docx(self, pdf_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of pdf_to_docx"""
+        # Create new DOCX document
+        doc = Document()
+        
+        def _add_page(page_num: int, text: str):
+            if text:
+                # Add page heading
+                if page_num > 0:
+                    doc.add_page_break()
+                doc.add_heading(f'Page {page_num + 1}', level=2)
+                # Add text content, one paragraph per page
+                doc.add_paragraph(text)
+        
+        if fitz is not None:
+            # MuPDF extracts text far faster than pdfplumber's pdfminer stack
+            context = self.get_context(job_id, pdf_path)
+            with context.lock:
+                for page_num, page in enumerate(context.document):
+                    _add_page(page_num, page.get_text("text").strip())
+        else:
+            import pdfplumber
             
-        work_dir = self._get_work_dir(job_id)
+            with pdfplumber.open(pdf_path) as pdf:
+                for page_num, page in enumerate(pdf.pages):
+                    _add_page(page_num, page.extract_text())
         
-        try:
-            def _convert_pptx_to_pdf():
-                from reportlab.lib.pagesizes import letter, landscape
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.utils import ImageReader
-                
-                # Read PowerPoint presentation
-                prs = Presentation(pptx_path)
-                
-                # Create PDF with reportlab
-                output_filename = self._get_original_filename_with_suffix(pptx_path, "to_pdf", "pdf")
-                output_path = work_dir / output_filename
-                
-                # Create PDF with landscape orientation
-                c = canvas.Canvas(str(output_path), pagesize=landscape(letter))
-                page_width, page_height = landscape(letter)
-                
-                # Extract text from each slide and add to PDF
-                for slide_num, slide in enumerate(prs.slides):
-                    # Extract all text from slide
-                    text_content = []
-                    for shape in slide.shapes:
-                        if hasattr(shape, "text"):
-                            if shape.text.strip():
-                                text_content.append(shape.text)
-                    
-                    # Add slide number
-                    c.setFont("Helvetica-Bold", 16)
-                    c.drawString(50, page_height - 50, f"Slide {slide_num + 1}")
-                    
-                    # Add text content
-                    c.setFont("Helvetica", 12)
-                    y_position = page_height - 100
-                    for text in text_content:
-                        # Wrap text if too long
-                        max_width = page_width - 100
-                        lines = []
-                        words = text.split()
-                        current_line = ""
-                        
-                        for word in words:
-                            test_line = current_line + " " + word if current_line else word
-                            if c.stringWidth(test_line, "Helvetica", 12) < max_width:
-                                current_line = test_line
-                            else:
-                                if current_line:
-                                    lines.append(current_line)
-                                current_line = word
-                        if current_line:
-                            lines.append(current_line)
-                        
-                        for line in lines:
-                            if y_position < 50:
-                                c.showPage()
-                                c.setFont("Helvetica", 12)
-                                y_position = page_height - 50
-                            c.drawString(50, y_position, line)
-                            y_position -= 20
-                    
-                    c.showPage()
-                
-                c.save()
+        # Save with original filename + suffix
+        output_filename = self._get_original_filename_with_suffix(pdf_path, "to_docx", "docx")
+        output_path = work_dir / output_filename
+        _atomic_write(output_path, lambda tmp: doc.save(str(tmp)))
+        return str(output_path)
+    
+    def _docx_to_pdf(self, docx_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of docx_to_pdf"""
+        # Read DOCX content
+        doc = Document(docx_path)
+        
+        output_filename = self._get_original_filename_with_suffix(docx_path, "to_pdf", "pdf")
+        output_path = work_dir / output_filename
+        
+        if _fitz_story_available():
+            paragraphs = [_html_paragraph(p.text) for p in doc.paragraphs if p.text.strip()]
+            body = "".join(paragraphs) or _html_paragraph("Document converted from DOCX")
+            _atomic_write(output_path, lambda tmp: _write_text_pdf(
+                tmp, [body], fitz.paper_rect("letter"), 72
+            ))
+            return str(output_path)
+        
+        # Create PDF with reportlab
+        pdf_doc = SimpleDocTemplate(str(output_path), pagesize=letter, **REPORTLAB_OPTIONS)
+        styles = SAMPLE_STYLES
+        story = []
+        
+        # Extract text from DOCX paragraphs
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                p = Paragraph(paragraph.text, styles['Normal'])
+                story.append(p)
+                story.append(Spacer(1, 12))
+        
+        if not story:
+            # Add a placeholder if no content
+            story.append(Paragraph("Document converted from DOCX", styles['Normal']))
+        
+        _atomic_write(output_path, lambda tmp: _build_doc(pdf_doc, story, tmp))
+        return str(output_path)
+    
+    def _pdf_to_xlsx(self, pdf_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of pdf_to_xlsx"""
+        # Create new Excel workbook
+        wb = Workbook()
+        
+        def _fill_sheet(page_num: int, tables, text: Optional[str]):
+            # Create sheet for each page
+            if page_num == 0:
+                ws = wb.active
+                ws.title = f"Page {page_num + 1}"
+            else:
+                ws = wb.create_sheet(title=f"Page {page_num + 1}")
+            
+            if tables:
+                row_offset = 1
+                for table in tables:
+                    for row in table:
+                        for col_idx, cell in enumerate(row):
+                            ws.cell(row=row_offset, column=col_idx + 1, value=cell)
+                        row_offset += 1
+                    row_offset += 1  # Add space between tables
+            elif text:
+                # Extract text if no tables
+                lines = text.split('\n')
+                for row_idx, line in enumerate(lines, start=1):
+                    ws.cell(row=row_idx, column=1, value=line)
+        
+        # PyMuPDF finds which pages have tables and extracts the text of the
+        # rest; pdfplumber's slower layout analysis only runs on table pages
+        page_texts = None
+        if fitz is not None:
+            context = self.get_context(job_id, pdf_path)
+            page_texts = []
+            with context.lock:
+                for page in context.document:
+                    find_tables = getattr(page, "find_tables", None)  # PyMuPDF >= 1.23
+                    if find_tables is None or find_tables().tables:
+                        page_texts.append(None)
+                    else:
+                        page_texts.append(page.get_text("text").rstrip())
+        
+        if page_texts is not None and all(text is not None for text in page_texts):
+            for page_num, text in enumerate(page_texts):
+                _fill_sheet(page_num, None, text)
+        else:
+            import pdfplumber
+            
+            with pdfplumber.open(pdf_path) as pdf:
+                for page_num, page in enumerate(pdf.pages):
+                    if page_texts is not None and page_texts[page_num] is not None:
+                        _fill_sheet(page_num, None, page_texts[page_num])
+                        continue
+                    # Extract tables if available
+                    tables = page.extract_tables()
+                    _fill_sheet(page_num, tables, None if tables else page.extract_text())
+        
+        # Save with original filename + suffix
+        output_filename = self._get_original_filename_with_suffix(pdf_path, "to_xlsx", "xlsx")
+        output_path = work_dir / output_filename
+        _atomic_write(output_path, lambda tmp: wb.save(str(tmp)))
+        return str(output_path)
+    
+    def _xlsx_to_pdf(self, xlsx_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of xlsx_to_pdf"""
+        # Read Excel content; read-only mode streams rows instead of building
+        # every cell object up front
+        wb = load_workbook(xlsx_path, data_only=True, read_only=True)
+        
+        # Create PDF with reportlab
+        output_filename = self._get_original_filename_with_suffix(xlsx_path, "to_pdf", "pdf")
+        output_path = work_dir / output_filename
+        
+        pdf_doc = SimpleDocTemplate(str(output_path), pagesize=LANDSCAPE_LETTER, **REPORTLAB_OPTIONS)
+        styles = SAMPLE_STYLES
+        story = []
+        
+        # Process each sheet
+        for sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            
+            # Add sheet title
+            story.append(Paragraph(f"<b>{sheet_name}</b>", styles['Heading1']))
+            
+            # Extract data from sheet, a table per XLSX_TABLE_ROWS rows; each
+            # table repeats the header row
+            header = None
+            rows = []
+            tables = 0
+            for row in ws.iter_rows(values_only=True):
+                row = [str(cell) if cell is not None else "" for cell in row]
+                if header is None:
+                    header = row
+                    continue
+                rows.append(row)
+                if len(rows) >= XLSX_TABLE_ROWS:
+                    story.append(_xlsx_table(header, rows))
+                    tables += 1
+                    rows = []
+            if header is not None and (rows or tables == 0):
+                story.append(_xlsx_table(header, rows))
+            
+            story.append(PageBreak())
+        wb.close()
+        
+        if not story:
+            story.append(Paragraph("Empty Excel document", styles['Normal']))
+        
+        _atomic_write(output_path, lambda tmp: _build_doc(pdf_doc, story, tmp))
+        return str(output_path)
+    
+    def _pdf_to_pptx(self, pdf_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of pdf_to_pptx"""
+        context = self.get_context(job_id, pdf_path)
+        
+        from pptx.util import Inches
+        
+        # Create new PowerPoint presentation
+        prs = Presentation()
+        prs.slide_width = Inches(10)
+        prs.slide_height = Inches(7.5)
+        
+        # One in-memory PNG buffer reused for every slide, no temp files
+        png_buffer = io.BytesIO()
+        
+        # Pages are rendered and PNG-encoded in
+        # the process pool in small ranges, while this thread adds finished
+        # ones to the presentation. Two ranges in flight per worker keep the
+        # pool busy without buffering the whole document's PNGs.
+        page_count = context.page_count
+        chunks = [range(i, min(i + PPTX_RENDER_BATCH, page_count))
+                  for i in range(0, page_count, PPTX_RENDER_BATCH)]
+        render = functools.partial(_render_png_range, pdf_path, zoom=PPTX_ZOOM)
+        rendered = _bounded_map(self.process_executor, render, chunks, 2 * self.process_workers)
+        page_pngs = (png for chunk in rendered for png in chunk)
+        
+        # Add each rendered page to the presentation
+        for png in page_pngs:
+            png_buffer.seek(0)
+            png_buffer.truncate(0)
+            png_buffer.write(png)
+            png_buffer.seek(0)
+            
+            # Add blank slide
+            blank_slide_layout = prs.slide_layouts[6]  # Blank layout
+            slide = prs.slides.add_slide(blank_slide_layout)
+            
+            # Add image to slide
+            left = Inches(0.5)
+            top = Inches(0.5)
+            height = Inches(6.5)
+            slide.shapes.add_picture(png_buffer, left, top, height=height)
+        
+        # Save with original filename + suffix
+        output_filename = self._get_original_filename_with_suffix(pdf_path, "to_pptx", "pptx")
+        output_path = work_dir / output_filename
+        _atomic_write(output_path, lambda tmp: prs.save(str(tmp)))
+        return str(output_path)
+    
+    def _pptx_to_pdf(self, pptx_path: str, work_dir: Path, job_id: str) -> str:
+        """Blocking body of pptx_to_pdf"""
+        # Read PowerPoint presentation
+        prs = Presentation(pptx_path)
+        
+        output_filename = self._get_original_filename_with_suffix(pptx_path, "to_pdf", "pdf")
+        output_path = work_dir / output_filename
+        
+        if _fitz_story_available():
+            # One section (starting a new landscape page) per slide
+            sections = []
+            for slide_num, slide in enumerate(prs.slides):
+                texts = [shape.text for shape in slide.shapes
+                         if hasattr(shape, "text") and shape.text.strip()]
+                heading = f"<h2 style='font-size: 16pt'>Slide {slide_num + 1}</h2>"
+                sections.append(heading + "".join(_html_paragraph(text) for text in texts))
+            if sections:
+                _atomic_write(output_path, lambda tmp: _write_text_pdf(
+                    tmp, sections, fitz.paper_rect("letter-l"), 50
+                ))
                 return str(output_path)
+        
+        # Create PDF with reportlab
+        from reportlab.pdfgen import canvas
+        
+        # Create PDF with landscape orientation; drawn in memory and then
+        # published through _atomic_write like every other output
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=LANDSCAPE_LETTER, **REPORTLAB_OPTIONS)
+        page_width, page_height = LANDSCAPE_LETTER
+        
+        # Glyph widths are additive, so each word is measured once and line
+        # widths are running sums rather than re-measuring the whole line
+        space_width = c.stringWidth(" ", "Helvetica", 12)
+        
+        # Extract text from each slide and add to PDF
+        for slide_num, slide in enumerate(prs.slides):
+            # Extract all text from slide
+            text_content = []
+            for shape in slide.shapes:
+                if hasattr(shape, "text"):
+                    if shape.text.strip():
+                        text_content.append(shape.text)
             
-            loop = asyncio.get_event_loop()
-            output_path = await loop.run_in_executor(self.executor, _convert_pptx_to_pdf)
-            return output_path
+            # Add slide number
+            c.setFont("Helvetica-Bold", 16)
+            c.drawString(50, page_height - 50, f"Slide {slide_num + 1}")
             
-        except Exception as e:
-            self._cleanup_work_dir(work_dir)
-            raise ConversionError(f"PPTX to PDF conversion failed: {str(e)}")
+            # Add text content
+            c.setFont("Helvetica", 12)
+            y_position = page_height - 100
+            for text in text_content:
+                # Wrap text if too long
+                max_width = page_width - 100
+                lines = []
+                current_words = []
+                current_width = 0.0
+                
+                for word in text.split():
+                    word_width = c.stringWidth(word, "Helvetica", 12)
+                    test_width = current_width + space_width + word_width if current_words else word_width
+                    if test_width < max_width:
+                        current_words.append(word)
+                        current_width = test_width
+                    else:
+                        if current_words:
+                            lines.append(" ".join(current_words))
+                        current_words = [word]
+                        current_width = word_width
+                if current_words:
+                    lines.append(" ".join(current_words))
+                
+                for line in lines:
+                    if y_position < 50:
+                        c.showPage()
+                        c.setFont("Helvetica", 12)
+                        y_position = page_height - 50
+                    c.drawString(50, y_position, line)
+                    y_position -= 20
+            
+            c.showPage()
+        
+        c.save()
+        _atomic_write(output_path, lambda tmp: tmp.write_bytes(buffer.getvalue()))
+        return str(output_path)
     
     # Image conversions
-    async def pdf_to_images(self, pdf_path: str, fmt: str = "png", dpi: int = 200, job_id: str = None) -> List[str]:
+    @cached("pdf_to_images", "fmt", "dpi", "jpeg_quality")
+    async def pdf_to_images(self, pdf_path: str, fmt: str = "png", dpi: int = 200, job_id: str = None,
+                            jpeg_quality: int = JPEG_QUALITY) -> List[str]:
         """Convert PDF pages to images using PyMuPDF"""
         if fitz is None:
             raise ConversionError("PyMuPDF not available. Please install pymupdf package.")
@@ -520,45 +1794,37 @@ class ConversionService:
         
         if fmt not in ['png', 'jpg', 'jpeg']:
             raise ConversionError(f"Unsupported image format: {fmt}")
+        if not 1 <= jpeg_quality <= 100:
+            raise ConversionError("JPEG quality must be between 1 and 100")
+        dpi = _snap_dpi(dpi)
         
         try:
-            def _convert_pages():
-                doc = fitz.open(pdf_path)
-                image_paths = []
-                
-                # Get original filename for prefix
-                original_name = Path(pdf_path).stem
-                
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    
-                    # Create matrix for DPI scaling
-                    mat = fitz.Matrix(dpi / 72, dpi / 72)
-                    pix = page.get_pixmap(matrix=mat, alpha=False)
-                    
-                    # Save image with original filename prefix
-                    if fmt in ['jpg', 'jpeg']:
-                        image_path = work_dir / f"{original_name}_page_{page_num + 1:03d}.jpg"
-                        pix.save(str(image_path), output="jpeg")
-                    else:
-                        image_path = work_dir / f"{original_name}_page_{page_num + 1:03d}.png"
-                        pix.save(str(image_path), output="png")
-                    
-                    image_paths.append(str(image_path))
-                    
-                doc.close()
-                return image_paths
+            context = self.get_context(job_id, pdf_path)
+            page_count = await _run_in(self.cpu_executor, lambda: context.page_count)
             
-            loop = asyncio.get_event_loop()
-            image_paths = await loop.run_in_executor(self.executor, _convert_pages)
-            return image_paths
+            # Each worker process opens the PDF itself and renders a
+            # contiguous page range, so rendering scales past the GIL
+            chunks = _page_chunks(page_count, self.process_workers)
+            results = await asyncio.gather(*(
+                _run_in(
+                    self.process_executor, _render_page_range,
+                    pdf_path, chunk.start, chunk.stop, dpi, fmt, str(work_dir), jpeg_quality
+                )
+                for chunk in chunks
+            ))
+            return [path for chunk_paths in results for path in chunk_paths]
             
         except Exception as e:
             self._cleanup_work_dir(work_dir)
             raise ConversionError(f"PDF to images conversion failed: {str(e)}")
     
-    async def images_to_pdf(self, image_paths: List[str], job_id: str = None) -> str:
-        """Convert multiple images to PDF"""
+    @cached("images_to_pdf")
+    async def images_to_pdf(self, image_paths: List[Union[str, "Image.Image"]], job_id: str = None) -> str:
+        """Convert multiple images to PDF
+        
+        Accepts file paths and/or in-memory PIL images; in-memory images are
+        not closed here and are not served from the cache.
+        """
         if Image is None:
             raise ConversionError("Pillow not available. Please install pillow package.")
             
@@ -570,38 +1836,79 @@ class ConversionService:
             
         work_dir = self._get_work_dir(job_id)
         # Create filename from first image
-        first_image_name = Path(image_paths[0]).stem if image_paths else "images"
+        first_image = image_paths[0]
+        first_image_name = Path(first_image).stem if isinstance(first_image, (str, os.PathLike)) else "images"
         output_filename = f"{first_image_name}_combined.pdf"
         output_path = work_dir / output_filename
         
         try:
             def _combine_images():
-                images = []
-                for img_path in image_paths:
-                    img = Image.open(img_path)
+                if img2pdf is not None and all(isinstance(p, (str, os.PathLike)) for p in image_paths):
+                    # img2pdf embeds JPEG (and JPEG 2000) streams as-is and
+                    # stores PNG losslessly, with pages sized as the Pillow
+                    # path does (200 DPI). It refuses some inputs, such as
+                    # images with an alpha channel; those go through Pillow.
+                    try:
+                        layout = img2pdf.get_fixed_dpi_layout_fun((200, 200))
+                        pdf_bytes = img2pdf.convert([str(p) for p in image_paths], layout_fun=layout)
+                    except Exception as e:
+                        logger.info(f"img2pdf declined inputs, re-encoding with Pillow: {e}")
+                    else:
+                        _atomic_write(output_path, lambda tmp: tmp.write_bytes(pdf_bytes))
+                        return str(output_path)
+                
+                def _load(img_path):
+                    """Decode one input as RGB; returns (image, images to close)"""
+                    owned = []
+                    if isinstance(img_path, (str, os.PathLike)):
+                        img = Image.open(img_path)
+                        if img.format == 'JPEG':
+                            # libjpeg can downscale while decoding; A4 @ 300 DPI is plenty
+                            img.draft('RGB', JPEG_DRAFT_SIZE)
+                        # Decode now so the file handle is released right away
+                        img.load()
+                        owned.append(img)
+                    else:
+                        # Already decoded in memory, no encode/decode round-trip
+                        img = img_path
                     # Convert to RGB if necessary
                     if img.mode != 'RGB':
                         img = img.convert('RGB')
-                    images.append(img)
+                        owned.append(img)
+                    return img, owned
                 
-                if images:
-                    # Save as PDF
-                    images[0].save(
-                        str(output_path),
-                        "PDF",
-                        resolution=200.0,
-                        save_all=True,
-                        append_images=images[1:] if len(images) > 1 else []
-                    )
-                    
-                # Close images to free memory
-                for img in images:
-                    img.close()
+                def _write(tmp: Path):
+                    # Pillow's PDF writer holds every appended image until the
+                    # file is done, so pages are written a batch at a time and
+                    # later batches appended; only one batch is decoded at once
+                    for offset in range(0, len(image_paths), IMAGES_PDF_BATCH):
+                        loaded = []
+                        try:
+                            for img_path in image_paths[offset:offset + IMAGES_PDF_BATCH]:
+                                loaded.append(_load(img_path))
+                            images = [img for img, _ in loaded]
+                            images[0].save(
+                                str(tmp),
+                                "PDF",
+                                resolution=200.0,
+                                # RGB pages are stored as JPEG; Pillow's default is 75
+                                quality=JPEG_QUALITY,
+                                save_all=True,
+                                append_images=images[1:],
+                                append=offset > 0
+                            )
+                        finally:
+                            # Close images we opened to free memory
+                            for _, owned in loaded:
+                                for img in owned:
+                                    img.close()
+                
+                _atomic_write(output_path, _write)
                     
                 return str(output_path)
             
-            loop = asyncio.get_event_loop()
-            result_path = await loop.run_in_executor(self.executor, _combine_images)
+            # Decoding and re-encoding images is CPU-bound
+            result_path = await _run_in(self.cpu_executor, _combine_images)
             return result_path
             
         except Exception as e:
@@ -609,7 +1916,95 @@ class ConversionService:
             raise ConversionError(f"Images to PDF conversion failed: {str(e)}")
     
     # Text extraction
-    async def pdf_to_txt(self, pdf_path: str, use_ocr: bool = False, job_id: str = None) -> str:
+    def _extract_text_str(self, pdf_path: str, use_ocr: bool = False, job_id: str = None,
+                          max_pages: Optional[int] = None) -> str:
+        """Extract text from PDF with optional OCR fallback (blocking)
+        
+        ``max_pages`` stops extraction early, e.g. for previews.
+        """
+        context = self.get_context(job_id, pdf_path)
+        
+        text = ""
+        
+        # Try PyMuPDF first (fastest)
+        if fitz:
+            try:
+                parts = []
+                with context.lock:
+                    for page_num, page in enumerate(context.document):
+                        if max_pages and page_num >= max_pages:
+                            break
+                        # sort=False keeps content-stream order and skips
+                        # the sort pass; blank/scanned pages come back empty
+                        # and are dropped without any further copies
+                        page_text = page.get_text("text", sort=False)
+                        if page_text and not page_text.isspace():
+                            parts.append(page_text)
+                text = "\n\n".join(parts)
+            except Exception as e:
+                logger.warning(f"PyMuPDF extraction failed: {e}")
+        
+        # Fallback to pdfminer if no text found. It is several times slower
+        # than PyMuPDF, so very long documents skip it.
+        if not text.strip() and pdfminer_extract_text and self._pdfminer_allowed(context, max_pages):
+            try:
+                text = pdfminer_extract_text(pdf_path, maxpages=max_pages or 0, laparams=PDFMINER_LAPARAMS)
+            except Exception as e:
+                logger.warning(f"PDFMiner extraction failed: {e}")
+        
+        # OCR fallback if enabled and no text found
+        if use_ocr and not text.strip() and not (pytesseract and fitz and Image):
+            self.degraded_jobs.add(job_id)
+        elif use_ocr and not text.strip():
+            try:
+                logger.info("Attempting OCR extraction...")
+                ocr_count = context.page_count
+                for limit in (settings.OCR_MAX_PAGES, max_pages):
+                    if limit:
+                        ocr_count = min(ocr_count, limit)
+                ocr_pages = range(ocr_count)
+                
+                # Rasterize from the document text extraction already parsed,
+                # and OCR a contiguous page range per tesseract run, one
+                # thread waiting on each; a range is OCR'd while the next
+                # one renders
+                chunks = _page_chunks(len(ocr_pages), self.process_workers)
+                mat = fitz.Matrix(OCR_ZOOM, OCR_ZOOM)
+                with ThreadPoolExecutor(max_workers=max(1, len(chunks)), thread_name_prefix="ocr") as ocr_pool:
+                    futures = []
+                    with context.lock:
+                        for chunk in chunks:
+                            tiff = _tiff_bytes([
+                                _pixmap_image(context.document.load_page(page_num).get_pixmap(matrix=mat, alpha=False))
+                                for page_num in chunk
+                            ])
+                            futures.append(ocr_pool.submit(_ocr_tiff, tiff, len(chunk), settings.OCR_LANG))
+                    parts = [text] if text else []
+                    for chunk, future in zip(chunks, futures):
+                        for page_num, ocr_text in zip(chunk, future.result()):
+                            if ocr_text.strip():
+                                parts.append(f"[Page {page_num + 1}]\n{ocr_text}")
+                text = "\n\n".join(parts)
+            except Exception as e:
+                logger.warning(f"OCR extraction failed: {e}")
+                self.degraded_jobs.add(job_id)
+        
+        return text
+    
+    @staticmethod
+    def _pdfminer_allowed(context: PdfContext, max_pages: Optional[int]) -> bool:
+        """Whether the pdfminer fallback is cheap enough for this document"""
+        if max_pages and max_pages <= settings.PDFMINER_MAX_PAGES:
+            return True
+        try:
+            return context.page_count <= settings.PDFMINER_MAX_PAGES
+        except Exception:
+            # PyMuPDF could not open it either; pdfminer is the last resort
+            return True
+    
+    @cached("pdf_to_txt", "use_ocr", "max_pages")
+    async def pdf_to_txt(self, pdf_path: str, use_ocr: bool = False, job_id: str = None,
+                         max_pages: Optional[int] = None) -> str:
         """Extract text from PDF with optional OCR fallback"""
         if job_id is None:
             job_id = str(uuid.uuid4())
@@ -621,61 +2016,17 @@ class ConversionService:
         
         try:
             def _extract_text():
-                text = ""
-                
-                # Try PyMuPDF first (fastest)
-                if fitz:
-                    try:
-                        doc = fitz.open(pdf_path)
-                        for page in doc:
-                            page_text = page.get_text()
-                            if page_text.strip():
-                                text += page_text + "\n\n"
-                        doc.close()
-                    except Exception as e:
-                        logger.warning(f"PyMuPDF extraction failed: {e}")
-                
-                # Fallback to pdfminer if no text found
-                if not text.strip() and pdfminer_extract_text:
-                    try:
-                        text = pdfminer_extract_text(pdf_path, laparams=LAParams())
-                    except Exception as e:
-                        logger.warning(f"PDFMiner extraction failed: {e}")
-                
-                # OCR fallback if enabled and no text found
-                if use_ocr and not text.strip() and pytesseract and fitz:
-                    try:
-                        logger.info("Attempting OCR extraction...")
-                        doc = fitz.open(pdf_path)
-                        for page_num in range(min(5, len(doc))):  # Limit OCR to first 5 pages
-                            page = doc.load_page(page_num)
-                            pix = page.get_pixmap()
-                            img_data = pix.tobytes("png")
-                            
-                            # Save temporary image for OCR
-                            temp_img_path = work_dir / f"temp_page_{page_num}.png"
-                            with open(temp_img_path, "wb") as f:
-                                f.write(img_data)
-                            
-                            # Run OCR
-                            ocr_text = pytesseract.image_to_string(str(temp_img_path), lang='por+eng')
-                            if ocr_text.strip():
-                                text += f"[Page {page_num + 1}]\n{ocr_text}\n\n"
-                            
-                            # Cleanup temp image
-                            temp_img_path.unlink(missing_ok=True)
-                        doc.close()
-                    except Exception as e:
-                        logger.warning(f"OCR extraction failed: {e}")
+                text = self._extract_text_str(pdf_path, use_ocr, job_id, max_pages)
                 
                 # Save extracted text
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(text if text.strip() else "No text could be extracted from this PDF.")
+                _atomic_write(
+                    output_path,
+                    lambda tmp: tmp.write_text(text if text.strip() else NO_TEXT_MESSAGE, encoding="utf-8")
+                )
                 
                 return str(output_path)
             
-            loop = asyncio.get_event_loop()
-            result_path = await loop.run_in_executor(self.executor, _extract_text)
+            result_path = await _run_in(self.cpu_executor, _extract_text)
             return result_path
             
         except Exception as e:
@@ -683,8 +2034,13 @@ class ConversionService:
             raise ConversionError(f"Text extraction failed: {str(e)}")
     
     # PDF operations
-    async def merge_pdfs(self, pdf_paths: List[str], job_id: str = None) -> str:
-        """Merge multiple PDFs into a single file preserving original names"""
+    @cached("merge_pdfs", "compress")
+    async def merge_pdfs(self, pdf_paths: List[str], job_id: str = None, compress: bool = False) -> str:
+        """Merge multiple PDFs into a single file preserving original names
+        
+        ``compress`` runs the structural compression pass on the merged
+        bytes before they are written.
+        """
         if not pdf_paths:
             raise ConversionError("No PDF files provided")
             
@@ -697,42 +2053,24 @@ class ConversionService:
         work_dir = self._get_work_dir(job_id)
         
         try:
-            def _merge_pdfs():
-                # Create output filename from first PDF
-                first_pdf_name = Path(pdf_paths[0]).stem if pdf_paths else "merged"
-                output_filename = f"{first_pdf_name}_merge.pdf"
-                output_path = work_dir / output_filename
-                
-                # Create merged document
-                merged_doc = fitz.open()
-                
-                for pdf_path in pdf_paths:
-                    try:
-                        source_doc = fitz.open(pdf_path)
-                        merged_doc.insert_pdf(source_doc)
-                        source_doc.close()
-                    except Exception as e:
-                        logger.warning(f"Error merging {pdf_path}: {e}")
-                        continue
-                
-                # Save merged PDF
-                merged_doc.save(str(output_path))
-                merged_doc.close()
-                
-                return str(output_path)
+            # Create output filename from first PDF
+            first_pdf_name = Path(pdf_paths[0]).stem if pdf_paths else "merged"
+            output_path = work_dir / f"{first_pdf_name}_merge.pdf"
             
-            loop = asyncio.get_event_loop()
-            result_path = await loop.run_in_executor(self.executor, _merge_pdfs)
-            return result_path
+            # Rebuilding the merged object graph is CPU-bound; run it in a worker process
+            return await _run_in(
+                self.process_executor, _merge_pdf_files, list(pdf_paths), str(output_path), compress
+            )
             
         except Exception as e:
             self._cleanup_work_dir(work_dir)
             raise ConversionError(f"PDF merge failed: {str(e)}")
     
+    @cached("split_pdf", "ranges")
     async def split_pdf(self, pdf_path: str, ranges: str, job_id: str = None) -> List[str]:
         """Split PDF into multiple files based on page ranges"""
-        if fitz is None:
-            raise ConversionError("PyMuPDF not available. Please install pymupdf package.")
+        if pikepdf is None and fitz is None:
+            raise ConversionError("PDF libraries not available. Please install pikepdf or pymupdf.")
             
         if job_id is None:
             job_id = str(uuid.uuid4())
@@ -740,52 +2078,37 @@ class ConversionService:
         work_dir = self._get_work_dir(job_id)
         
         try:
-            def _split_pdf():
-                doc = fitz.open(pdf_path)
-                total_pages = len(doc)
-                output_files = []
-                
-                # Get original filename for prefix
-                original_name = Path(pdf_path).stem
-                
-                # Parse ranges (e.g., "1-3,5,7-10")
-                page_ranges = []
-                for range_part in ranges.split(','):
-                    range_part = range_part.strip()
-                    if '-' in range_part:
-                        start, end = map(int, range_part.split('-'))
-                        page_ranges.append((start - 1, end - 1))  # Convert to 0-based
-                    else:
-                        page_num = int(range_part) - 1  # Convert to 0-based
-                        page_ranges.append((page_num, page_num))
-                
-                # Create split documents with original filename
-                for i, (start, end) in enumerate(page_ranges):
-                    if start < 0 or end >= total_pages or start > end:
-                        continue
-                        
-                    split_doc = fitz.open()
-                    split_doc.insert_pdf(doc, from_page=start, to_page=end)
-                    
-                    # Use original filename with split suffix
-                    output_filename = f"{original_name}_split_{i + 1}_pages_{start + 1}-{end + 1}.pdf"
-                    output_path = work_dir / output_filename
-                    split_doc.save(str(output_path))
-                    split_doc.close()
-                    
-                    output_files.append(str(output_path))
-                
-                doc.close()
-                return output_files
+            context = self.get_context(job_id, pdf_path)
+            
+            def _count_pages() -> int:
+                if fitz is not None:
+                    return context.page_count
+                with pikepdf.open(pdf_path) as src:
+                    return len(src.pages)
+            
+            page_ranges = _parse_page_ranges(ranges, await asyncio.to_thread(_count_pages))
+            
+            # Use original filename with split suffix
+            original_name = Path(pdf_path).stem
+            splits = [
+                (start, end, str(work_dir / f"{original_name}_split_{i + 1}_pages_{start + 1}-{end + 1}.pdf"))
+                for i, (start, end) in enumerate(page_ranges)
+            ]
             
-            loop = asyncio.get_event_loop()
-            result_files = await loop.run_in_executor(self.executor, _split_pdf)
-            return result_files
+            # Writing each output is CPU-bound serialization, so ranges are
+            # spread over the process pool; each worker opens the source once
+            groups = [splits[chunk.start:chunk.stop] for chunk in _page_chunks(len(splits), self.process_workers)]
+            results = await asyncio.gather(*(
+                _run_in(self.process_executor, _write_splits, pdf_path, group)
+                for group in groups
+            ))
+            return [path for group_paths in results for path in group_paths]
             
         except Exception as e:
             self._cleanup_work_dir(work_dir)
             raise ConversionError(f"PDF split failed: {str(e)}")
     
+    @cached("compress_pdf", "grayscale", "rasterize")
     async def compress_pdf(self, pdf_path: str, job_id: str = None, 
                           grayscale: bool = False, rasterize: bool = False) -> Dict[str, Any]:
         """Compress PDF file using Ghostscript with advanced compression
@@ -812,8 +2135,7 @@ class ConversionService:
                     rasterize=rasterize
                 )
             
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(self.executor, _compress_pdf)
+            result = await asyncio.to_thread(_compress_pdf)
             
             if result["success"]:
                 logger.info(f"Compression successful: {result['input_bytes']} -> {result['output_bytes']} bytes ({result['ratio']:.1f}% reduction)")
@@ -827,6 +2149,7 @@ class ConversionService:
             self._cleanup_work_dir(work_dir)
             raise ConversionError(f"PDF compression failed: {str(e)}")
     
+    @cached("extract_text_to_pdf")
     async def extract_text_to_pdf(self, pdf_path: str, job_id: str = None) -> str:
         """Extract text and create a new text-only PDF"""
         if job_id is None:
@@ -835,60 +2158,60 @@ class ConversionService:
         work_dir = self._get_work_dir(job_id)
         
         try:
-            # First extract text
-            txt_path = await self.pdf_to_txt(pdf_path, job_id=job_id)
-            
-            # Read extracted text
-            with open(txt_path, "r", encoding="utf-8") as f:
-                text_content = f.read()
+            def _extract_text() -> str:
+                # Keep the extracted text in memory, no .txt round-trip through disk
+                text_content = self._extract_text_str(pdf_path, False, job_id)
+                return text_content if text_content.strip() else NO_TEXT_MESSAGE
             
             # Create text-only PDF using reportlab if available
-            try:
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.pagesizes import letter, A4
-                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet
-                from reportlab.lib.units import inch
-                
-                output_path = work_dir / "text_only.pdf"
-                doc = SimpleDocTemplate(str(output_path), pagesize=A4)
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Split text into paragraphs
-                paragraphs = text_content.split('\n\n')
-                for para_text in paragraphs:
-                    if para_text.strip():
-                        para = Paragraph(para_text.strip(), styles['Normal'])
-                        story.append(para)
-                        story.append(Spacer(1, 12))
-                
-                doc.build(story)
-                return str(output_path)
-                
-            except ImportError:
-                # Fallback: convert text to LibreOffice document then to PDF
-                txt_doc_path = work_dir / "extracted_text.odt"
-                
-                # Create ODT document with LibreOffice
-                cmd = [
-                    "soffice", "--headless", "--invisible", "--nodefault",
-                    "--norestore", "--nologo", "--convert-to", "odt",
-                    "--outdir", str(work_dir), txt_path
-                ]
-                
-                subprocess.run(cmd, capture_output=True, timeout=30)
+            if SimpleDocTemplate is not None:
+                def _build_pdf():
+                    # Extraction and layout run back to back on one worker
+                    text_content = _extract_text()
+                    output_path = work_dir / "text_only.pdf"
+                    doc = SimpleDocTemplate(str(output_path), pagesize=A4, **REPORTLAB_OPTIONS)
+                    styles = SAMPLE_STYLES
+                    story = []
+                    
+                    # Walk paragraphs (runs of non-empty lines) in place rather
+                    # than materializing a second copy of the text as a list.
+                    # Platypus cost is per flowable, so paragraphs are packed
+                    # into ~2KB flowables separated by blank lines
+                    batch, batch_len = [], 0
+                    for match in _PARAGRAPH_RE.finditer(text_content):
+                        para_text = match.group().strip()
+                        if not para_text:
+                            continue
+                        batch.append(html.escape(para_text, quote=False))
+                        batch_len += len(para_text)
+                        if batch_len >= TEXT_PARAGRAPH_CHARS:
+                            story.append(Paragraph("<br/><br/>".join(batch), styles['Normal']))
+                            story.append(Spacer(1, 12))
+                            batch, batch_len = [], 0
+                    if batch:
+                        story.append(Paragraph("<br/><br/>".join(batch), styles['Normal']))
+                    
+                    _atomic_write(output_path, lambda tmp: _build_doc(doc, story, tmp))
+                    return str(output_path)
                 
-                # Convert ODT to PDF
-                output_path = await self.docx_to_pdf(str(txt_doc_path), job_id)
-                return output_path
+                return await _run_in(self.cpu_executor, _build_pdf)
+            
+            # Fallback: have LibreOffice typeset the text straight to PDF, on a
+            # warm instance when available. It needs the text on disk.
+            text_content = await asyncio.to_thread(_extract_text)
+            txt_path = work_dir / "extracted_text.txt"
+            txt_path.write_text(text_content, encoding="utf-8")
+            return await self._run_libreoffice_conversion(str(txt_path), str(work_dir), "pdf", 30)
             
         except Exception as e:
             self._cleanup_work_dir(work_dir)
             raise ConversionError(f"Text-to-PDF conversion failed: {str(e)}")
     
+    @cached("create_ico_from_pdf", "sizes")
     async def create_ico_from_pdf(self, pdf_path: str, sizes: List[int] = None, job_id: str = None) -> str:
         """Create ICO file from first page of PDF"""
+        if fitz is None or Image is None:
+            raise ConversionError("Required libraries not available. Please install pymupdf and pillow.")
         if sizes is None:
             sizes = [16, 32, 48, 64, 128, 256]
             
@@ -898,33 +2221,11 @@ class ConversionService:
         work_dir = self._get_work_dir(job_id)
         
         try:
-            # First convert PDF to PNG
-            png_paths = await self.pdf_to_images(pdf_path, fmt="png", dpi=300, job_id=job_id)
-            if not png_paths:
-                raise ConversionError("No pages found in PDF")
-            
-            # Use first page
-            first_page_path = png_paths[0]
-            
-            def _create_ico():
-                with Image.open(first_page_path) as img:
-                    # Create ICO with multiple sizes
-                    ico_images = []
-                    for size in sizes:
-                        resized = img.resize((size, size), Image.Resampling.LANCZOS)
-                        ico_images.append(resized)
-                    
-                    output_path = work_dir / "icon.ico"
-                    ico_images[0].save(
-                        str(output_path),
-                        format='ICO',
-                        sizes=[(size, size) for size in sizes]
-                    )
-                    
-                    return str(output_path)
-            
-            loop = asyncio.get_event_loop()
-            result_path = await loop.run_in_executor(self.executor, _create_ico)
+            # Resampling and ICO encoding are CPU-bound Python/C work, so the
+            # icon is built in the process pool from the file on disk
+            result_path = await _run_in(
+                self.process_executor, _create_ico, pdf_path, list(sizes), str(work_dir / "icon.ico")
+            )
             return result_path
             
         except Exception as e:
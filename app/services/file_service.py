@@ -4,13 +4,19 @@ File management service for HubPDF
 import os
 import shutil
 import tempfile
+import time
 import uuid
 from pathlib import Path
 from typing import BinaryIO, Optional
-from datetime import datetime, timedelta
+from functools import lru_cache
 
 from app.utils.security import sanitize_filename
 
+@lru_cache(maxsize=1024)
+def _job_directory(base_dir: Path, user_id: int, job_id: str) -> Path:
+    """Build (once) the directory path for a user's job"""
+    return base_dir / str(user_id) / job_id
+
 class FileService:
     """Service for managing temporary files"""
     
@@ -27,7 +33,7 @@ class FileService:
     
     def get_job_directory(self, user_id: int, job_id: str) -> Path:
         """Get job directory path"""
-        return self.temp_base_dir / str(user_id) / job_id
+        return _job_directory(self.temp_base_dir, user_id, job_id)
     
     def save_upload_file(self, user_id: int, job_id: str, file: BinaryIO, 
                         original_filename: str) -> Path:
@@ -37,9 +43,16 @@ class FileService:
         
         file_path = job_dir / safe_filename
         
-        with open(file_path, "wb") as f:
-            file.seek(0)
-            shutil.copyfileobj(file, f)
+        # Uploads spooled to a named file on disk are copied by path, which
+        # lets shutil.copyfile use sendfile/copy_file_range in the kernel
+        source_name = getattr(file, "name", None)
+        if isinstance(source_name, str) and os.path.isfile(source_name):
+            file.flush()
+            shutil.copyfile(source_name, file_path)
+        else:
+            with open(file_path, "wb") as f:
+                file.seek(0)
+                shutil.copyfileobj(file, f, length=1024 * 1024)
         
         return file_path
     
@@ -50,9 +63,7 @@ class FileService:
         safe_filename = sanitize_filename(filename)
         
         file_path = job_dir / safe_filename
-        
-        with open(file_path, "wb") as f:
-            f.write(content)
+        file_path.write_bytes(content)
         
         return file_path
     
@@ -64,34 +75,47 @@ class FileService:
     
     def cleanup_old_files(self) -> None:
         """Clean up files older than retention period"""
-        cutoff_time = datetime.now() - timedelta(minutes=self.retention_minutes)
+        # Plain float comparison against st_mtime; scandir entries carry
+        # their type from the directory read, so no Path objects are built
+        cutoff_time = time.time() - self.retention_minutes * 60
         
-        if not self.temp_base_dir.exists():
+        try:
+            user_dirs = os.scandir(self.temp_base_dir)
+        except OSError:
             return
         
-        for user_dir in self.temp_base_dir.iterdir():
-            if not user_dir.is_dir():
-                continue
-            
-            for job_dir in user_dir.iterdir():
-                if not job_dir.is_dir():
+        with user_dirs:
+            for user_dir in user_dirs:
+                if not user_dir.is_dir(follow_symlinks=False):
                     continue
                 
-                # Check directory modification time
+                remaining = 0
                 try:
-                    mtime = datetime.fromtimestamp(job_dir.stat().st_mtime)
-                    if mtime < cutoff_time:
-                        shutil.rmtree(job_dir, ignore_errors=True)
-                except (OSError, ValueError):
-                    # If we can't read the time, assume it's old and delete it
-                    shutil.rmtree(job_dir, ignore_errors=True)
-            
-            # Remove empty user directories
-            try:
-                if not any(user_dir.iterdir()):
-                    user_dir.rmdir()
-            except OSError:
-                pass
+                    with os.scandir(user_dir.path) as job_dirs:
+                        for job_dir in job_dirs:
+                            if not job_dir.is_dir(follow_symlinks=False):
+                                remaining += 1
+                                continue
+                            
+                            # Check directory modification time
+                            try:
+                                expired = job_dir.stat(follow_symlinks=False).st_mtime < cutoff_time
+                            except OSError:
+                                # If we can't read the time, assume it's old and delete it
+                                expired = True
+                            if expired:
+                                shutil.rmtree(job_dir.path, ignore_errors=True)
+                            else:
+                                remaining += 1
+                except OSError:
+                    continue
+                
+                # Remove empty user directories
+                if not remaining:
+                    try:
+                        os.rmdir(user_dir.path)
+                    except OSError:
+                        pass
     
     def get_file_content(self, user_id: int, job_id: str, filename: str) -> Optional[bytes]:
         """Get file content from temporary directory"""
@@ -3,15 +3,19 @@ Job management service for handling asynchronous conversion tasks
 """
 import uuid
 import time
+import heapq
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Any
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 import json
 
-from app.services.conversion import conversion_service, ConversionError
+from app.config import settings
+from app.services.conversion import conversion_service, ConversionError, JPEG_QUALITY
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,8 @@ class JobResult:
     error: Optional[str] = None
     created_at: float = None
     completed_at: Optional[float] = None
+    # Serialized to_dict() output, cleared by JobRegistry.update_job
+    _cached_json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.created_at is None:
@@ -40,16 +46,39 @@ class JobResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        data['status'] = self.status.value
-        return data
+        return {
+            'job_id': self.job_id,
+            'status': self.status.value,
+            'progress': self.progress,
+            'message': self.message,
+            'output_files': self.output_files,  # shared, callers only read it
+            'error': self.error,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at,
+        }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialized to_dict(), cached until the job is next updated"""
+        if self._cached_json is None:
+            self._cached_json = json.dumps(
+                self.to_dict(), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+        return self._cached_json
+
+# Number of locks shared by all jobs in the registry
+LOCK_STRIPES = 256
 
 class JobRegistry:
     """In-memory job registry with optional persistence"""
     
     def __init__(self):
-        self.jobs: Dict[str, JobResult] = {}
-        self.locks: Dict[str, asyncio.Lock] = {}
+        # Insertion order is creation order, so the newest jobs sit at the tail
+        self.jobs: "OrderedDict[str, JobResult]" = OrderedDict()
+        # Fixed pool of locks striped by job id, so finished jobs leave no
+        # per-job lock objects behind
+        self._lock_pool = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+        # Min-heap of (created_at, job_id) for expiry without a full scan
+        self._expiry: List[tuple] = []
         self.cleanup_task = None
         
     def create_job(self, job_id: str = None) -> str:
@@ -66,10 +95,15 @@ class JobRegistry:
         )
         
         self.jobs[job_id] = job
-        self.locks[job_id] = asyncio.Lock()
+        self.jobs.move_to_end(job_id)
+        heapq.heappush(self._expiry, (job.created_at, job_id))
         
         return job_id
     
+    def lock_for(self, job_id: str) -> asyncio.Lock:
+        """Lock guarding a job's state changes (shared with other ids on the same stripe)"""
+        return self._lock_pool[hash(job_id) % LOCK_STRIPES]
+    
     def get_job(self, job_id: str) -> Optional[JobResult]:
         """Get job by ID"""
         return self.jobs.get(job_id)
@@ -81,28 +115,33 @@ class JobRegistry:
             for key, value in kwargs.items():
                 if hasattr(job, key):
                     setattr(job, key, value)
+            job._cached_json = None
     
     def list_jobs(self, limit: int = 50) -> List[JobResult]:
         """List recent jobs"""
-        jobs = list(self.jobs.values())
-        jobs.sort(key=lambda x: x.created_at, reverse=True)
-        return jobs[:limit]
+        return list(islice(reversed(self.jobs.values()), limit))
     
     def cleanup_old_jobs(self, max_age_hours: int = 24):
         """Remove old completed jobs"""
         current_time = time.time()
         cutoff_time = current_time - (max_age_hours * 3600)
         
-        jobs_to_remove = []
-        for job_id, job in self.jobs.items():
-            if (job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED] and
-                job.created_at < cutoff_time):
-                jobs_to_remove.append(job_id)
+        # Only entries older than the cutoff are popped; jobs still running
+        # are pushed back so they are reconsidered on the next pass
+        still_active = []
+        while self._expiry and self._expiry[0][0] < cutoff_time:
+            created_at, job_id = heapq.heappop(self._expiry)
+            job = self.jobs.get(job_id)
+            if job is None or job.created_at != created_at:
+                continue  # stale entry for a removed or re-created job
+            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+                self.jobs.pop(job_id, None)
+                logger.info(f"Cleaned up old job: {job_id}")
+            else:
+                still_active.append((created_at, job_id))
         
-        for job_id in jobs_to_remove:
-            self.jobs.pop(job_id, None)
-            self.locks.pop(job_id, None)
-            logger.info(f"Cleaned up old job: {job_id}")
+        for entry in still_active:
+            heapq.heappush(self._expiry, entry)
 
 # Global job registry
 job_registry = JobRegistry()
@@ -112,15 +151,33 @@ class ConversionJobService:
     
     def __init__(self):
         self.registry = job_registry
+        # Bursts of jobs wait here instead of all starting Ghostscript,
+        # PyMuPDF or soffice work at once; same-kind jobs are capped lower
+        # since they compete for the same resources
+        self.job_slots = asyncio.Semaphore(max(1, settings.MAX_CONCURRENT_JOBS))
+        self.operation_slots: Dict[str, asyncio.Semaphore] = {}
+    
+    def _operation_slot(self, operation: str) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent jobs of one operation"""
+        slot = self.operation_slots.get(operation)
+        if slot is None:
+            slot = asyncio.Semaphore(max(1, settings.MAX_CONCURRENT_JOBS_PER_OPERATION))
+            self.operation_slots[operation] = slot
+        return slot
     
     async def start_conversion(
         self, 
         operation: str, 
         input_files: List[str], 
         options: Dict[str, Any] = None,
-        job_id: str = None
+        job_id: str = None,
+        on_failure: Optional[Callable[[], None]] = None
     ) -> str:
-        """Start a new conversion job"""
+        """Start a new conversion job
+        
+        on_failure runs in a worker thread if the job fails, e.g. to give
+        back the quota reserved for it.
+        """
         # Create job if not provided
         if job_id is None:
             job_id = str(uuid.uuid4())
@@ -132,7 +189,9 @@ class ConversionJobService:
         logger.info(f"Starting conversion job {job_id} with operation {operation}")
         
         # Start the conversion in the background
-        asyncio.create_task(self._run_conversion_job(job_id, operation, input_files, options or {}))
+        asyncio.create_task(
+            self._run_conversion_job(job_id, operation, input_files, options or {}, on_failure)
+        )
         
         return job_id
     
@@ -141,37 +200,43 @@ class ConversionJobService:
         job_id: str, 
         operation: str, 
         input_files: List[str], 
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        on_failure: Optional[Callable[[], None]] = None
     ):
         """Run the conversion job"""
         try:
-            # Ensure job exists and has lock
-            if job_id not in self.registry.locks:
-                self.registry.locks[job_id] = asyncio.Lock()
-                
-            async with self.registry.locks[job_id]:
-                logger.info(f"Running conversion job {job_id}")
-                
-                self.registry.update_job(
-                    job_id,
-                    status=JobStatus.RUNNING,
-                    progress=10,
-                    message=f"Starting {operation} conversion..."
-                )
+            async with self._operation_slot(operation), self.job_slots:
+                # The stripe lock is shared with other job ids, so hold it
+                # only around state changes, never across the conversion
+                async with self.registry.lock_for(job_id):
+                    job = self.registry.get_job(job_id)
+                    if job is not None and job.status == JobStatus.CANCELLED:
+                        logger.info(f"Skipping cancelled job {job_id}")
+                        return
+                    
+                    logger.info(f"Running conversion job {job_id}")
+                    
+                    self.registry.update_job(
+                        job_id,
+                        status=JobStatus.RUNNING,
+                        progress=10,
+                        message=f"Starting {operation} conversion..."
+                    )
                 
                 # Route to appropriate conversion method
                 output_files = await self._execute_conversion(
                     operation, input_files, options, job_id
                 )
                 
-                self.registry.update_job(
-                    job_id,
-                    status=JobStatus.COMPLETED,
-                    progress=100,
-                    message="Conversion completed successfully",
-                    output_files=output_files,
-                    completed_at=time.time()
-                )
+                async with self.registry.lock_for(job_id):
+                    self.registry.update_job(
+                        job_id,
+                        status=JobStatus.COMPLETED,
+                        progress=100,
+                        message="Conversion completed successfully",
+                        output_files=output_files,
+                        completed_at=time.time()
+                    )
                 logger.info(f"Job {job_id} completed successfully")
                 
         except Exception as e:
@@ -184,6 +249,14 @@ class ConversionJobService:
                 error=str(e),
                 completed_at=time.time()
             )
+            if on_failure is not None:
+                try:
+                    await asyncio.to_thread(on_failure)
+                except Exception:
+                    logger.exception(f"Failure callback for job {job_id} failed")
+        finally:
+            # Close documents kept open across the job's stages
+            conversion_service.release_job(job_id)
     
     async def _execute_conversion(
         self, 
@@ -207,6 +280,9 @@ class ConversionJobService:
                 return [result]
                 
             elif operation == "docx_to_pdf":
+                if len(input_files) > 1:
+                    self.registry.update_job(job_id, progress=50, message="Converting documents...")
+                    return await conversion_service.docx_to_pdf_many(input_files, job_id)
                 result = await conversion_service.docx_to_pdf(input_file, job_id)
                 return [result]
                 
@@ -229,8 +305,11 @@ class ConversionJobService:
             elif operation == "pdf_to_images":
                 fmt = options.get("format", "png")
                 dpi = options.get("dpi", 200)
+                jpeg_quality = options.get("jpeg_quality", JPEG_QUALITY)
                 self.registry.update_job(job_id, progress=50, message="Converting pages to images...")
-                results = await conversion_service.pdf_to_images(input_file, fmt, dpi, job_id)
+                results = await conversion_service.pdf_to_images(
+                    input_file, fmt, dpi, job_id, jpeg_quality=jpeg_quality
+                )
                 return results
                 
             elif operation == "images_to_pdf":
@@ -276,7 +355,8 @@ class ConversionJobService:
                 
             elif operation == "merge_pdf":
                 self.registry.update_job(job_id, progress=50, message="Merging PDF files...")
-                result = await conversion_service.merge_pdfs(input_files, job_id)
+                compress = options.get("compress", False)
+                result = await conversion_service.merge_pdfs(input_files, job_id, compress=compress)
                 return [result]
                 
             elif operation == "extract_text_to_pdf":
@@ -305,23 +385,36 @@ class ConversionJobService:
             return job.to_dict()
         return None
     
+    def get_job_json(self, job_id: str) -> Optional[bytes]:
+        """Get job status as pre-serialized JSON"""
+        job = self.registry.get_job(job_id)
+        if job:
+            return job.to_json_bytes()
+        return None
+    
     def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
         """List recent jobs"""
         jobs = self.registry.list_jobs(limit)
         return [job.to_dict() for job in jobs]
     
+    def list_jobs_json(self, limit: int = 50) -> bytes:
+        """List recent jobs as a pre-serialized {"jobs": [...]} document"""
+        jobs = self.registry.list_jobs(limit)
+        return b'{"jobs":[' + b",".join(job.to_json_bytes() for job in jobs) + b']}'
+    
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job"""
-        job = self.registry.get_job(job_id)
-        if job and job.status in [JobStatus.PENDING, JobStatus.RUNNING]:
-            self.registry.update_job(
-                job_id,
-                status=JobStatus.CANCELLED,
-                message="Job cancelled by user",
-                completed_at=time.time()
-            )
-            return True
-        return False
+        async with self.registry.lock_for(job_id):
+            job = self.registry.get_job(job_id)
+            if job and job.status in [JobStatus.PENDING, JobStatus.RUNNING]:
+                self.registry.update_job(
+                    job_id,
+                    status=JobStatus.CANCELLED,
+                    message="Job cancelled by user",
+                    completed_at=time.time()
+                )
+                return True
+            return False
 
 # Global service instance
 job_service = ConversionJobService()
\ No newline at end of file
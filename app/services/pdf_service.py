@@ -1,8 +1,12 @@
 """
 PDF processing service for HubPDF
+
+Not imported by any router: live conversions go through
+app.services.conversion.
 """
 import os
 import io
+import functools
 import zipfile
 import tempfile
 from pathlib import Path
@@ -17,13 +21,33 @@ from reportlab.lib import colors
 from reportlab.lib.units import inch
 
 try:
-    import pdf2image
-    PDF2IMAGE_AVAILABLE = True
+    import fitz  # PyMuPDF
 except ImportError:
-    PDF2IMAGE_AVAILABLE = False
+    fitz = None
 
 from app.utils.security import sanitize_filename
 
+# Formats MuPDF can encode a pixmap to directly
+PIXMAP_FORMATS = {"png", "jpg", "jpeg"}
+# Pages rendered per process-pool task by pdf_to_images
+RENDER_CHUNK_PAGES = 8
+
+def _render_pages(pdf_path: str, pages: range, ext: Optional[str]) -> list:
+    """Render pages at 200 dpi. Runs in the conversion process pool.
+    
+    Returns encoded image bytes per page, or (width, height, samples) when
+    ``ext`` is None so the caller can post-process the raw RGB pixels.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        results = []
+        for page_num in pages:
+            pix = doc.load_page(page_num).get_pixmap(dpi=200, colorspace=fitz.csRGB, alpha=False)
+            results.append(pix.tobytes(ext) if ext else (pix.width, pix.height, pix.samples))
+        return results
+    finally:
+        doc.close()
+
 class PDFService:
     """Service for PDF operations"""
     
@@ -51,28 +75,24 @@ class PDFService:
             c.saveState()
             c.translate(300, 400)
             c.rotate(45)
-            c.drawCentredText(0, 0, watermark_text)
+            c.drawCentredString(0, 0, watermark_text)
             c.restoreState()
             c.save()
             
-            watermark_buffer.seek(0)
-            watermark_pdf = PyPDF2.PdfReader(watermark_buffer)
-            
-            # Apply watermark to original PDF
-            input_pdf = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-            output_pdf = PyPDF2.PdfWriter()
-            
-            for page_num in range(len(input_pdf.pages)):
-                page = input_pdf.pages[page_num]
-                if watermark_pdf.pages:
-                    page.merge_page(watermark_pdf.pages[0])
-                output_pdf.add_page(page)
-            
+            # Overlay with pikepdf (qpdf): the letter-sized watermark is drawn
+            # unscaled from each page's origin, as a page merge would place it
             output_buffer = io.BytesIO()
-            output_pdf.write(output_buffer)
-            output_buffer.seek(0)
+            with pikepdf.open(io.BytesIO(pdf_bytes)) as pdf, \
+                    pikepdf.open(io.BytesIO(watermark_buffer.getvalue())) as watermark_pdf:
+                if watermark_pdf.pages:
+                    form = pdf.copy_foreign(watermark_pdf.pages[0].as_form_xobject())
+                    wm_width, wm_height = letter
+                    for page in pdf.pages:
+                        x0, y0 = float(page.mediabox[0]), float(page.mediabox[1])
+                        page.add_overlay(form, pikepdf.Rectangle(x0, y0, x0 + wm_width, y0 + wm_height))
+                pdf.save(output_buffer, compress_streams=True)
             
-            return output_buffer.read()
+            return output_buffer.getvalue()
         
         except Exception as e:
             # If watermarking fails, return original PDF
@@ -82,18 +102,23 @@ class PDFService:
                    apply_watermark: bool = False, watermark_text: str = "") -> bytes:
         """Merge multiple PDF files"""
         try:
-            merger = PyPDF2.PdfMerger()
-            
-            for pdf_file in pdf_files:
-                pdf_file.seek(0)
-                merger.append(pdf_file)
-            
+            # qpdf copies the pages natively; sources stay open until the
+            # output is saved since copied pages still reference them
             output_buffer = io.BytesIO()
-            merger.write(output_buffer)
-            merger.close()
+            sources = []
+            try:
+                with pikepdf.Pdf.new() as merged:
+                    for pdf_file in pdf_files:
+                        pdf_file.seek(0)
+                        src = pikepdf.open(pdf_file)
+                        sources.append(src)
+                        merged.pages.extend(src.pages)
+                    merged.save(output_buffer, compress_streams=True)
+            finally:
+                for src in sources:
+                    src.close()
             
-            output_buffer.seek(0)
-            result_bytes = output_buffer.read()
+            result_bytes = output_buffer.getvalue()
             
             if apply_watermark and watermark_text:
                 result_bytes = self.add_watermark(result_bytes, watermark_text)
@@ -127,26 +152,28 @@ class PDFService:
             
             # Create split PDFs
             zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zip_file:
                 for i, (start, end) in enumerate(ranges):
                     output_pdf = PyPDF2.PdfWriter()
                     
                     for page_num in range(max(0, start), min(end, total_pages)):
                         output_pdf.add_page(input_pdf.pages[page_num])
                     
+                    # PdfWriter needs tell() for its xref offsets, which zip
+                    # entry streams lack, so each split is staged once and
+                    # handed to the zip as a view rather than a bytes copy
                     pdf_buffer = io.BytesIO()
                     output_pdf.write(pdf_buffer)
-                    pdf_buffer.seek(0)
-                    
-                    pdf_bytes = pdf_buffer.read()
                     
                     if apply_watermark and watermark_text:
-                        pdf_bytes = self.add_watermark(pdf_bytes, watermark_text)
+                        pdf_data = self.add_watermark(pdf_buffer.getvalue(), watermark_text)
+                    else:
+                        pdf_data = pdf_buffer.getbuffer()
                     
-                    zip_file.writestr(f"split_{i+1}.pdf", pdf_bytes)
+                    zip_file.writestr(f"split_{i+1}.pdf", pdf_data)
+                    del pdf_data  # release the view so the buffer can be freed
             
-            zip_buffer.seek(0)
-            return zip_buffer.read()
+            return zip_buffer.getvalue()
         
         except Exception as e:
             raise Exception(f"Failed to split PDF: {str(e)}")
@@ -176,26 +203,57 @@ class PDFService:
     def pdf_to_images(self, pdf_file: BinaryIO, user_id: int, job_id: str,
                       format: str = "png", apply_watermark: bool = False, 
                       watermark_text: str = "") -> bytes:
-        """Convert PDF to images and return as ZIP"""
+        """Convert PDF to images and return as ZIP
+        
+        Blocks until every page is rendered; call it from a worker thread
+        (e.g. run_in_threadpool), not directly on the event loop.
+        """
+        # Imported here: importing conversion builds the shared service and
+        # its pools, which spawned render workers loading this module for
+        # _render_pages must not do
+        from app.services.conversion import PROCESS_EXECUTOR, PROCESS_WORKERS, _bounded_map
+        
+        source_path = None
         try:
             pdf_file.seek(0)
             temp_dir = self.create_user_temp_dir(user_id, job_id)
             
-            if PDF2IMAGE_AVAILABLE:
-                # Use pdf2image for better quality
-                images = pdf2image.convert_from_bytes(pdf_file.read(), dpi=200)
-            else:
-                # Fallback to basic conversion
-                # This is a simplified fallback - in production you'd want a more robust solution
+            if fitz is None:
                 raise Exception("PDF to image conversion not available")
             
+            # MuPDF renders without a poppler subprocess or PIL round-trip.
+            # Pages are spread over the process pool from a copy on disk, with
+            # a bounded number of chunks in flight so long PDFs don't pile up
+            # in memory; results come back in page order
+            source_path = temp_dir / "pdf_to_images_source.pdf"
+            source_path.write_bytes(pdf_file.read())
+            with fitz.open(source_path) as doc:
+                page_count = doc.page_count
+            ext = format.lower()
+            watermark = apply_watermark and watermark_text
+            render_ext = ext if not watermark and ext in PIXMAP_FORMATS else None
+            
+            chunks = [
+                range(start, min(start + RENDER_CHUNK_PAGES, page_count))
+                for start in range(0, page_count, RENDER_CHUNK_PAGES)
+            ]
+            render = functools.partial(_render_pages, str(source_path), ext=render_ext)
+            rendered = _bounded_map(PROCESS_EXECUTOR, render, chunks, 2 * PROCESS_WORKERS)
+            pages = (page for chunk in rendered for page in chunk)
+            
             zip_buffer = io.BytesIO()
             with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                for i, image in enumerate(images):
+                for i, page in enumerate(pages):
+                    if render_ext:
+                        zip_file.writestr(f"page_{i+1}.{ext}", page)
+                        continue
+                    
+                    width, height, samples = page
+                    image = Image.frombytes("RGB", (width, height), samples)
                     img_buffer = io.BytesIO()
                     
                     # Add text watermark to image if needed
-                    if apply_watermark and watermark_text:
+                    if watermark:
                         from PIL import ImageDraw, ImageFont
                         draw = ImageDraw.Draw(image)
                         # Use default font
@@ -220,16 +278,18 @@ class PDFService:
                         image = Image.alpha_composite(image.convert('RGBA'), overlay)
                         image = image.convert('RGB')
                     
-                    image.save(img_buffer, format=format.upper())
-                    img_buffer.seek(0)
-                    
-                    zip_file.writestr(f"page_{i+1}.{format.lower()}", img_buffer.read())
+                    image.save(img_buffer, format="JPEG" if ext == "jpg" else format.upper())
+                    zip_file.writestr(f"page_{i+1}.{ext}", img_buffer.getvalue())
             
             zip_buffer.seek(0)
             return zip_buffer.read()
         
         except Exception as e:
             raise Exception(f"Failed to convert PDF to images: {str(e)}")
+        finally:
+            # Remove the staged copy even when rendering fails
+            if source_path is not None:
+                source_path.unlink(missing_ok=True)
     
     def images_to_pdf(self, image_files: List[BinaryIO], user_id: int, job_id: str,
                       apply_watermark: bool = False, watermark_text: str = "") -> bytes:
@@ -3,12 +3,15 @@ Quota management service for HubPDF
 """
 from datetime import datetime, date
 from typing import Dict, Any, Tuple, Optional, Union
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import Request
 
+from app.database import SessionLocal
 from app.models import User, QuotaUsage
 from app.config import settings
 from app.services.anon_service import anon_service
+from app.template_helpers import t
 
 class QuotaService:
     """Service for managing user quotas and limits"""
@@ -81,14 +84,17 @@ class QuotaService:
         ).first()
         
         if not quota_usage:
-            quota_usage = QuotaUsage(
-                user_id=user.id,
-                date=today,
-                operations_count=0
+            # A concurrent request may create the row first; keep theirs
+            db.execute(
+                self._insert(db)
+                .values(user_id=user.id, date=today, operations_count=0)
+                .on_conflict_do_nothing(index_elements=["user_id", "date"])
             )
-            db.add(quota_usage)
             db.commit()
-            db.refresh(quota_usage)
+            quota_usage = db.query(QuotaUsage).filter(
+                QuotaUsage.user_id == user.id,
+                QuotaUsage.date == today
+            ).first()
         
         return quota_usage
     
@@ -102,7 +108,7 @@ class QuotaService:
         
         # Check daily limit
         if quota_usage.operations_count >= limits["daily_operations"]:
-            return False, translate("quota_exceeded", "pt"), False
+            return False, t("quota_exceeded"), False
         
         # Check if watermark is required
         requires_watermark = False
@@ -112,6 +118,83 @@ class QuotaService:
         
         return True, "", requires_watermark
     
+    @staticmethod
+    def _insert(db: Session):
+        """Dialect-specific INSERT construct supporting ON CONFLICT"""
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(QuotaUsage)
+    
+    def reserve_operation(self, db: Session, user: User) -> Tuple[bool, str, bool]:
+        """
+        Check the daily limit and count the operation in one step
+        Returns: (allowed, message, requires_watermark)
+        
+        A single INSERT ... ON CONFLICT DO UPDATE creates today's row or
+        increments it while the count is below the plan limit, so concurrent
+        requests cannot overshoot it. The reservation is committed right away
+        so it holds no lock while files upload; call release_operation if the
+        operation does not start or fails.
+        """
+        limits = self.get_plan_limits(user.plan)
+        if limits["daily_operations"] < 1:
+            return False, t("quota_exceeded"), False
+        
+        stmt = self._insert(db).values(
+            user_id=user.id,
+            date=date.today(),
+            operations_count=1
+        )
+        new_count = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "date"],
+                set_={
+                    "operations_count": QuotaUsage.operations_count + 1,
+                    "updated_at": func.now()
+                },
+                where=QuotaUsage.operations_count < limits["daily_operations"]
+            ).returning(QuotaUsage.operations_count)
+        ).scalar()
+        
+        if new_count is None:
+            # The row exists and the limit is reached; nothing was written
+            return False, t("quota_exceeded"), False
+        db.commit()
+        
+        # Check if watermark is required (count before this operation)
+        threshold = limits["watermark_threshold"]
+        requires_watermark = threshold is not None and new_count - 1 >= threshold
+        
+        return True, "", requires_watermark
+    
+    def _decrement(self, db: Session, user_id: int) -> None:
+        """Take one off today's operation count, never below zero"""
+        db.query(QuotaUsage).filter(
+            QuotaUsage.user_id == user_id,
+            QuotaUsage.date == date.today(),
+            QuotaUsage.operations_count > 0
+        ).update(
+            {QuotaUsage.operations_count: QuotaUsage.operations_count - 1},
+            synchronize_session=False
+        )
+    
+    def release_operation(self, db: Session, user: User) -> None:
+        """Give back an operation reserved by reserve_operation"""
+        self._decrement(db, user.id)
+        db.commit()
+    
+    def refund_operation(self, user_id: int) -> None:
+        """Give back a reserved operation from outside a request, e.g. when a
+        background job fails"""
+        db = SessionLocal()
+        try:
+            self._decrement(db, user_id)
+            db.commit()
+        finally:
+            db.close()
+    
     def check_file_size_allowed(self, user: User, file_size: int) -> Tuple[bool, str]:
         """Check if file size is within user's plan limits - size validation removed"""
         # File size validation removed - users can upload large files
@@ -124,12 +207,6 @@ class QuotaService:
         
         return True, ""
     
-    def increment_operation_count(self, db: Session, user: User) -> None:
-        """Increment user's daily operation count"""
-        quota_usage = self.get_user_quota_usage(db, user)
-        quota_usage.operations_count += 1
-        db.commit()
-    
     def get_usage_summary(self, db: Session, user: User) -> Dict[str, Any]:
         """Get usage summary for user"""
         if not user:
@@ -1,5 +1,7 @@
 """
 Watermark service for PDF documents
+
+Not imported by any router at the moment.
 """
 import io
 from typing import BinaryIO, Optional
@@ -7,9 +9,11 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.colors import Color
 from reportlab.lib.units import inch
-from PyPDF2 import PdfReader, PdfWriter
+import pikepdf
 import math
 
+from app.template_helpers import get_translations
+
 
 
 class WatermarkService:
@@ -91,32 +95,37 @@ class WatermarkService:
             translations = get_translations(locale)
             watermark_text = translations.get("watermark_text", "HubPDF - Grátis")
         
-        # Read input PDF
-        input_buffer = io.BytesIO(pdf_bytes)
-        reader = PdfReader(input_buffer)
-        writer = PdfWriter()
-        
-        # Process each page
-        for page_num, page in enumerate(reader.pages):
-            # Get page dimensions
-            page_box = page.mediabox
-            width = float(page_box.width)
-            height = float(page_box.height)
-            
-            # Create watermark for this page size
-            watermark_bytes = self.create_watermark_pdf(watermark_text, width, height)
-            watermark_buffer = io.BytesIO(watermark_bytes)
-            watermark_reader = PdfReader(watermark_buffer)
-            watermark_page = watermark_reader.pages[0]
-            
-            # Merge watermark with original page
-            page.merge_page(watermark_page)
-            writer.add_page(page)
-        
-        # Write output
+        # Overlay with pikepdf (qpdf) instead of merging page objects in
+        # Python. Overlays are built per page size; most documents use a
+        # single size, so the overlay is drawn and parsed only once
+        watermark_forms = {}
+        overlay_pdfs = []
         output_buffer = io.BytesIO()
-        writer.write(output_buffer)
-        output_buffer.seek(0)
+        with pikepdf.open(io.BytesIO(pdf_bytes)) as pdf:
+            try:
+                for page in pdf.pages:
+                    # Get page dimensions
+                    page_box = pikepdf.Rectangle(page.mediabox)
+                    width = page_box.width
+                    height = page_box.height
+                    
+                    # Create watermark for this page size
+                    key = (round(width, 1), round(height, 1))
+                    form = watermark_forms.get(key)
+                    if form is None:
+                        watermark_bytes = self.create_watermark_pdf(watermark_text, width, height)
+                        overlay_pdf = pikepdf.open(io.BytesIO(watermark_bytes))
+                        overlay_pdfs.append(overlay_pdf)
+                        form = pdf.copy_foreign(overlay_pdf.pages[0].as_form_xobject())
+                        watermark_forms[key] = form
+                    
+                    # Draw the watermark over the original page
+                    page.add_overlay(form, page_box)
+                
+                pdf.save(output_buffer, compress_streams=True)
+            finally:
+                for overlay_pdf in overlay_pdfs:
+                    overlay_pdf.close()
         
         return output_buffer.getvalue()
     
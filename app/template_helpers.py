@@ -2,6 +2,7 @@
 Centralized template helpers for HubPDF
 """
 from fastapi.templating import Jinja2Templates
+from types import MappingProxyType
 import json
 
 # Create centralized templates instance
@@ -390,19 +391,28 @@ PT_TRANSLATIONS = {
   "footer_copyright": "© 2025 HubPDF – Desenvolvido por Diego Moura de Andrade - Estudante na Cruzeiro do Sul / Braz Cubas - CST ADS"
 }
 
+# Read-only view shared by every request (no per-response copies)
+TRANSLATIONS = MappingProxyType(PT_TRANSLATIONS)
+
+def get_translations(locale: str = "pt") -> MappingProxyType:
+    """Return the translation table (Portuguese is the only locale)"""
+    return TRANSLATIONS
+
 def t(key: str, default: str | None = None, **kwargs) -> str:
     """Translation function - returns Portuguese text (platform is Portuguese-only)"""
-    text = PT_TRANSLATIONS.get(key, default or key)
+    text = TRANSLATIONS.get(key, default or key)
     
     if kwargs:
         text = text.format(**kwargs)
     
     return text
 
+# Swaps the thousands and decimal separators in one pass
+_BRL_SEPARATORS = str.maketrans({",": ".", ".": ","})
+
 def price_brl(value: float) -> str:
     """Format price in Brazilian Real (BRL) format with comma as decimal separator"""
-    txt = f"{value:,.2f}"
-    return "R$ " + txt.replace(",", "X").replace(".", ",").replace("X", ".")
+    return "R$ " + format(value, ",.2f").translate(_BRL_SEPARATORS)
 
 # Register global functions
 templates.env.globals["price_brl"] = price_brl
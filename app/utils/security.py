@@ -1,9 +1,11 @@
 """
 Security utility functions
 """
+import re
 import secrets
 import hashlib
 import hmac
+from functools import lru_cache
 from typing import Optional
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, HashingError
@@ -49,11 +51,13 @@ def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> boo
     except Exception:
         return False
 
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\s.-]')
+
+@lru_cache(maxsize=8192)
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to prevent path traversal attacks"""
-    import re
     # Remove any path separators and special characters
-    sanitized = re.sub(r'[^\w\s.-]', '', filename)
+    sanitized = _UNSAFE_FILENAME_CHARS.sub('', filename)
     # Remove leading dots and spaces
     sanitized = sanitized.lstrip('. ')
     # Limit length
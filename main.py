@@ -45,6 +45,15 @@ async def cleanup_temp_files():
                     shutil.rmtree(user_dir)
                 except Exception:
                     pass  # Ignore errors during cleanup
+    
+    # Leftover staging files from conversions interrupted mid-write
+    from app.services.conversion import conversion_service
+    for part_file in conversion_service.temp_dir.glob("*/*.part"):
+        try:
+            if current_time - part_file.stat().st_mtime > 1800:
+                part_file.unlink()
+        except Exception:
+            pass
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -63,6 +72,9 @@ async def lifespan(app: FastAPI):
     from app.services.job_service import job_registry
     cleanup_job_task = asyncio.create_task(periodic_job_cleanup())
     
+    # Sweep stale conversion work dirs and trim the conversion cache
+    conversion_sweep_task = asyncio.create_task(periodic_conversion_sweep())
+    
     print("✅ HubPDF app started successfully")
     
     yield
@@ -71,9 +83,11 @@ async def lifespan(app: FastAPI):
     print("🛑 Shutting down HubPDF...")
     cleanup_task.cancel()
     cleanup_job_task.cancel()
+    conversion_sweep_task.cancel()
     try:
         await cleanup_task
         await cleanup_job_task
+        await conversion_sweep_task
     except asyncio.CancelledError:
         pass
 
@@ -93,6 +107,26 @@ async def periodic_job_cleanup():
             print(f"Job cleanup failed: {e}")
         await asyncio.sleep(3600)  # 1 hour
 
+async def periodic_conversion_sweep():
+    """Remove stale conversion work dirs every 5 minutes"""
+    from app.services.conversion import conversion_service
+    from app.services.job_service import job_registry
+    while True:
+        await asyncio.sleep(300)  # 5 minutes
+        try:
+            # Results of jobs still in the registry may yet be downloaded
+            await asyncio.to_thread(
+                conversion_service.sweep_work_dirs,
+                settings.WORKDIR_TTL_SECONDS,
+                set(job_registry.jobs)
+            )
+            await asyncio.to_thread(
+                conversion_service.evict_cache,
+                settings.CONVERSION_CACHE_MAX_MB * 1024 * 1024
+            )
+        except Exception as e:
+            print(f"Conversion sweep failed: {e}")
+
 # Create FastAPI app
 app = FastAPI(
     title="HubPDF",